@@ -0,0 +1,59 @@
+# Built-in imports
+import os
+import sys
+import time
+import argparse
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(1, os.path.join(ROOT, "src"))
+sys.path.insert(1, ROOT)
+
+# Third-party imports
+
+# Local imports
+from utils.aggregation import (
+    _aggregate_wallet_pay_data,
+    _aggregate_wallet_pay_data_loop,
+)
+from tests.test_wallet_aggregation import generate_raw_datas
+
+
+def best_of(function, raw_datas: list, repeat: int) -> tuple:
+    # (fastest run in seconds, result of the last run)
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        results = function(raw_datas)
+        timings.append(time.perf_counter() - started)
+    return min(timings), results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Time the NumPy wallet aggregation against the loop"
+    )
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--float", action="store_true", help="float instead of integer amounts"
+    )
+    args = parser.parse_args()
+
+    raw_datas = generate_raw_datas(args.rows, integer_issued=not args.float)
+    # The first NumPy call pays for its import
+    _aggregate_wallet_pay_data(raw_datas[:10])
+
+    loop_elapsed, loop_results = best_of(
+        _aggregate_wallet_pay_data_loop, raw_datas, args.repeat
+    )
+    numpy_elapsed, numpy_results = best_of(
+        _aggregate_wallet_pay_data, raw_datas, args.repeat
+    )
+    if numpy_results != loop_results:
+        sys.exit("NumPy and loop results differ")
+
+    print(
+        f"{args.rows} rows, best of {args.repeat}: "
+        f"loop {loop_elapsed * 1000:.1f} ms, numpy {numpy_elapsed * 1000:.1f} ms "
+        f"({loop_elapsed / numpy_elapsed:.2f}x)"
+    )
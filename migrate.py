@@ -0,0 +1,133 @@
+# Built-in imports
+import os
+import sys
+import argparse
+
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), "./src")))
+
+# Third-party imports
+from dotenv import load_dotenv
+
+load_dotenv(override=True)
+
+# Local imports
+from base.config import logger
+from utils.pool import PostgresPool
+from utils.shard import _parse_shards
+from utils.database import (
+    _set_client_postgres,
+    _set_client_postgres_shards,
+    _check_postgres_connection,
+    _get_postgres_shards,
+    _postgres_shard,
+)
+from utils.migration import (
+    _list_migrations,
+    _get_applied_migrations,
+    _apply_migrations,
+)
+from utils.partition import _ensure_pay_partitions, _detach_pay_partitions
+
+
+def connect() -> None:
+    # Only the sync Postgres pools, one connection each: no Redis, no startup
+    # migrations or partition maintenance as the app does
+    _set_client_postgres(
+        postgres_pool=PostgresPool(
+            minconn=0,
+            maxconn=1,
+            dbname=os.getenv("POSTGRES_DBNAME"),
+            user=os.getenv("POSTGRES_USER"),
+            password=os.getenv("POSTGRES_PASSWORD"),
+            host=os.getenv("POSTGRES_HOST"),
+            port=os.getenv("POSTGRES_PORT"),
+        )
+    )
+    _set_client_postgres_shards(
+        postgres_pools={
+            shard: PostgresPool(minconn=0, maxconn=1, dsn=dsn)
+            for shard, dsn in _parse_shards(os.getenv("POSTGRES_SHARDS")).items()
+        },
+        postgres_async_pools={},
+    )
+    for shard in [None, *_get_postgres_shards()]:
+        with _postgres_shard(shard):
+            if not _check_postgres_connection():
+                logger.error(f"PostgreSQL {shard or 'default'} failed. Exiting...")
+                sys.exit(1)
+
+
+def status(include_optional: bool) -> None:
+    applied = _get_applied_migrations()
+    for migration in _list_migrations(include_optional=include_optional):
+        state = "applied" if migration["version"] in applied else "pending"
+        optional = " (optional)" if migration["optional"] else ""
+        print(f"[{state:>7}] {migration['version']}_{migration['name']}{optional}")
+
+
+def upgrade(include_optional: bool) -> None:
+    applied = _apply_migrations(include_optional=include_optional)
+    if not applied:
+        logger.info("Database schema is up to date.")
+    elif include_optional:
+        # Workers cache table columns, they only pick up e.g. pay.account_id
+        # once restarted
+        logger.warning("Restart running workers to use optional schema changes.")
+
+
+def partitions(months_ahead: int, detach_older_than: int, archive_schema: str):
+    _ensure_pay_partitions(months_ahead=months_ahead)
+    if detach_older_than is not None:
+        _detach_pay_partitions(
+            older_than_months=detach_older_than, archive_schema=archive_schema
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Billy database migrations")
+    parser.add_argument("command", choices=["status", "upgrade", "partitions"])
+    parser.add_argument(
+        "--with-optional",
+        action="store_true",
+        help="include optional migrations (e.g. pay.account_id denormalization), "
+        "running workers use them after a restart",
+    )
+    parser.add_argument(
+        "--months-ahead",
+        type=int,
+        default=int(os.getenv("POSTGRES_PAY_PARTITIONS_AHEAD", 3)),
+        help="partitions: months of future pay partitions to create",
+    )
+    parser.add_argument(
+        "--detach-older-than",
+        type=int,
+        default=None,
+        help="partitions: detach pay partitions older than this many months "
+        "(their pays drop out of raw-row wallet reads)",
+    )
+    parser.add_argument(
+        "--archive-schema",
+        default=None,
+        help="partitions: move detached partitions into this schema",
+    )
+    args = parser.parse_args()
+
+    # The database pools, including POSTGRES_SHARDS
+    connect()
+
+    # The default database, then every account shard (POSTGRES_SHARDS)
+    shards = _get_postgres_shards()
+    for shard in [None, *shards]:
+        if shards:
+            print(f"== {shard or 'default'} ==")
+        with _postgres_shard(shard):
+            if args.command == "status":
+                status(include_optional=args.with_optional)
+            elif args.command == "upgrade":
+                upgrade(include_optional=args.with_optional)
+            elif args.command == "partitions":
+                partitions(
+                    months_ahead=args.months_ahead,
+                    detach_older_than=args.detach_older_than,
+                    archive_schema=args.archive_schema,
+                )
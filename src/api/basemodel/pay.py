@@ -0,0 +1,26 @@
+# Built-in imports
+from enum import Enum
+from datetime import datetime
+
+# Third-party imports
+from pydantic import BaseModel, Field
+
+# Local imports
+
+
+class FlowType(Enum):
+    IN = "IN"
+    OUT = "OUT"
+
+
+class PayItem(BaseModel):
+    wallet: str
+    flow: FlowType
+    description: str
+    issued: float
+    created_at: datetime
+
+
+class PayBatchRequest(BaseModel):
+    account_id: str
+    pays: list[PayItem] = Field(min_length=1, max_length=10000)
@@ -0,0 +1,16 @@
+# Built-in imports
+from typing import Annotated
+
+# Third-party imports
+from fastapi import Depends, Request
+
+# Local imports
+from app.billy_web import BillyWeb
+
+
+def _get_billy_web(request: Request) -> BillyWeb:
+    # Created once per worker process by the app lifespan (start_restapi.py)
+    return request.app.state.billy_web
+
+
+BillyWebDependency = Annotated[BillyWeb, Depends(_get_billy_web)]
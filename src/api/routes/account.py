@@ -1,37 +1,27 @@
 # Built-in imports
-import os
-import io
-import sys
-import uuid
-import random
-import json
-import time
-import base64
-from typing import Annotated, Union
 
 # Third-party imports
-import uvicorn
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi import APIRouter, Depends, Request, HTTPException, File, UploadFile
-from fastapi.responses import Response, JSONResponse, FileResponse, StreamingResponse
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse
 
 # Local imports
-from base.config import logger, billy_web
+from base.config import logger
 from base.exception import BillyResponse
+from api.dependency import BillyWebDependency
 
 router = APIRouter(prefix="/api/v1/account", tags=["account"])
 
 
 @router.post("/signup")
-def signup(
+async def signup(
+    billy_web: BillyWebDependency,
     full_name: str,
     email: str,
     telp: str,
     password: str,
     pin: str,
 ):
-    billy_web._register_account(
+    await billy_web._register_account(
         full_name=full_name, email=email, telp=telp, password=password, pin=pin
     )
 
@@ -45,7 +35,7 @@ def signup(
 
 
 @router.post("/login")
-def login(username: str, password: str):
+def login(billy_web: BillyWebDependency, username: str, password: str):
     response = billy_web._login_authorized_user(username=username, password=password)
     if response is BillyResponse.INVALID_INPUT:
         raise HTTPException(
@@ -68,11 +58,15 @@ def login(username: str, password: str):
 
 
 @router.get("/telegram/login")
-def telegram_login(email: str, telegram_id: str):
+async def telegram_login(
+    billy_web: BillyWebDependency, email: str, telegram_id: str
+):
     """
     USED IN EMAIL LINK LOGIN
     """
-    response = billy_web._validate_email_link(email=email, telegram_id=telegram_id)
+    response = await billy_web._validate_email_link(
+        email=email, telegram_id=telegram_id
+    )
 
     if response is BillyResponse.NOT_FOUND:
         raise HTTPException(
@@ -90,8 +84,10 @@ def telegram_login(email: str, telegram_id: str):
 
 
 @router.post("/telegram/session")
-def telegram_session(telegram_id: str):
-    response, account_id = billy_web._validate_telegram_session(telegram_id=telegram_id)
+async def telegram_session(billy_web: BillyWebDependency, telegram_id: str):
+    response, account_id = await billy_web._validate_telegram_session(
+        telegram_id=telegram_id
+    )
     if response is BillyResponse.UNAUTHORIZED:
         raise HTTPException(
             status_code=401,
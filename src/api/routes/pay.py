@@ -1,44 +1,29 @@
 # Built-in imports
-import os
-import io
-import sys
-import uuid
-import random
-import json
-import time
-import base64
-from enum import Enum
 from datetime import datetime
-from typing import Annotated, Union
 
 # Third-party imports
-import uvicorn
-from fastapi import FastAPI, Query
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi import APIRouter, Depends, Request, HTTPException, File, UploadFile
-from fastapi.responses import Response, JSONResponse, FileResponse, StreamingResponse
-
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse
 
 # Local imports
-from base.config import logger, billy_web
+from base.config import logger
+from base.exception import BillyResponse
+from api.dependency import BillyWebDependency
+from api.basemodel.pay import FlowType, PayBatchRequest
 
 router = APIRouter(prefix="/api/v1/pay", tags=["pay"])
 
 
-class FlowType(Enum):
-    IN = "IN"
-    OUT = "OUT"
-
-
 @router.post("/in")
-def pay_in(
+async def pay_in(
+    billy_web: BillyWebDependency,
     account_id: str,
     wallet: str,
     description: str,
     issued: float,
     created_at: datetime,
 ):
-    billy_web._insert_pay_data(
+    await billy_web._insert_pay_data(
         account_id=account_id,
         wallet=wallet,
         flow=FlowType.IN,
@@ -57,14 +42,15 @@ def pay_in(
 
 
 @router.post("/out")
-def pay_out(
+async def pay_out(
+    billy_web: BillyWebDependency,
     account_id: str,
     wallet: str,
     description: str,
     issued: float,
     created_at: datetime,
 ):
-    billy_web._insert_pay_data(
+    await billy_web._insert_pay_data(
         account_id=account_id,
         wallet=wallet,
         flow=FlowType.OUT,
@@ -80,3 +66,48 @@ def pay_out(
             "message": "Pay OUT data inserted successfully.",
         },
     )
+
+
+@router.post("/batch")
+async def pay_batch(billy_web: BillyWebDependency, request: PayBatchRequest):
+    response = await billy_web._insert_pay_batch(
+        account_id=request.account_id,
+        pays=[pay.model_dump() for pay in request.pays],
+    )
+    if response is BillyResponse.NOT_FOUND:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Account '{request.account_id}' not found.",
+        )
+
+    inserted = sum(1 for result in response if result["status"] == "success")
+    return JSONResponse(
+        status_code=200,
+        content={
+            "status": "success",
+            "message": f"{inserted} of {len(response)} pay data inserted successfully.",
+            "data": response,
+        },
+    )
+
+
+@router.post("/deactivate")
+async def pay_deactivate(
+    billy_web: BillyWebDependency, account_id: str, pay_id: str
+):
+    response = await billy_web._deactivate_pay_data(
+        account_id=account_id, pay_id=pay_id
+    )
+    if response is BillyResponse.NOT_FOUND:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Active pay '{pay_id}' not found.",
+        )
+
+    return JSONResponse(
+        status_code=200,
+        content={
+            "status": "success",
+            "message": "Pay data deactivated successfully.",
+        },
+    )
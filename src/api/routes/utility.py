@@ -1,26 +1,17 @@
 # Built-in imports
-import os
-import io
-import sys
-import uuid
-import random
-import json
-import time
-import base64
-from typing import Annotated, Union
+from typing import Annotated
 
 # Third-party imports
-import uvicorn
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi import APIRouter, Depends, Request, HTTPException, File, UploadFile
-from fastapi.responses import Response, JSONResponse, FileResponse, StreamingResponse
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
 
 # Local imports
 from base.config import logger
 from base.exception import BillyResponse
 from api.basemodel.utility import EmailRequest
+from api.routes.user import get_current_user
 from utils.messaging import send_email
+from utils.database import _get_query_stats
 
 
 router = APIRouter(prefix="/api/v1/utility", tags=["utility"])
@@ -47,3 +38,35 @@ def utility_send_email(email: EmailRequest):
             "message": "Success to send email.",
         },
     )
+
+
+@router.get("/query_stats")
+def utility_query_stats():
+    # Statement fingerprints of this worker process, slowest in total first
+    stats = _get_query_stats().snapshot()
+    return JSONResponse(
+        status_code=200,
+        content={
+            "status": "success",
+            "message": f"{len(stats)} statement fingerprints.",
+            "data": stats,
+        },
+    )
+
+
+@router.delete("/query_stats")
+def utility_reset_query_stats(user: Annotated[dict, Depends(get_current_user)]):
+    # Start a new measurement window, returns the stats it discarded
+    query_stats = _get_query_stats()
+    stats = query_stats.snapshot()
+    query_stats.reset()
+    logger.info(f"Query stats reset by {user['username']}.")
+
+    return JSONResponse(
+        status_code=200,
+        content={
+            "status": "success",
+            "message": f"{len(stats)} statement fingerprints.",
+            "data": stats,
+        },
+    )
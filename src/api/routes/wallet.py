@@ -1,32 +1,46 @@
 # Built-in imports
-import os
-import io
-import sys
-import uuid
-import random
 import json
-import time
-import base64
-from typing import Annotated, Union
+from typing import Literal
 
 # Third-party imports
-import uvicorn
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi import APIRouter, Depends, Request, HTTPException, File, UploadFile
-from fastapi.responses import Response, JSONResponse, FileResponse, StreamingResponse
-
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse, StreamingResponse
 
 # Local imports
-from base.config import logger, billy_web
+from base.config import logger
 from base.exception import BillyResponse
+from app.billy_web import BillyWeb
+from api.dependency import BillyWebDependency
 
 router = APIRouter(prefix="/api/v1/wallet", tags=["wallet"])
 
 
+def _parse_month(value: str) -> tuple:
+    # "YYYY-MM" query parameter to a (year, month) tuple
+    year, month = int(value[:4]), int(value[5:])
+    if not 1 <= month <= 12:
+        raise HTTPException(status_code=400, detail=f"Invalid month '{value}'.")
+    return year, month
+
+
 @router.get("/get_pay")
-def get_pay(account_id: str, wallet: str):
-    response = billy_web._get_wallet_pay_data(account_id=account_id, wallet=wallet)
+async def get_pay(
+    billy_web: BillyWebDependency,
+    account_id: str,
+    wallet: str,
+    include_data: bool = True,
+    start: str = Query(None, pattern=r"^\d{4}-\d{2}$"),
+    end: str = Query(None, pattern=r"^\d{4}-\d{2}$"),
+    aggregate: Literal["python", "sql"] = "python",
+):
+    response = await billy_web._get_wallet_pay_data(
+        account_id=account_id,
+        wallet=wallet,
+        include_data=include_data,
+        start_month=_parse_month(start) if start else None,
+        end_month=_parse_month(end) if end else None,
+        aggregate=aggregate,
+    )
     if response is BillyResponse.NOT_FOUND:
         raise HTTPException(
             status_code=400,
@@ -42,9 +56,79 @@ def get_pay(account_id: str, wallet: str):
     )
 
 
+def _stream_json_response(message: str, batches) -> StreamingResponse:
+    # Write the usual response envelope around batches of rows as they come
+    # in, one chunk per batch
+    def content():
+        yield json.dumps({"status": "success", "message": message})[:-1]
+        yield ', "data": ['
+        separator = ""
+        for batch in batches:
+            if batch:
+                yield separator + ",".join(json.dumps(data) for data in batch)
+                separator = ","
+        yield "]}"
+
+    return StreamingResponse(content(), media_type="application/json")
+
+
 @router.get("/get_pay_raw")
-def get_pay_raw(account_id: str, wallet: str):
-    response = billy_web._get_wallet_pay_raw_data(account_id=account_id, wallet=wallet)
+async def get_pay_raw(
+    billy_web: BillyWebDependency,
+    account_id: str,
+    wallet: str,
+    stream: bool = False,
+    limit: int = Query(None, ge=1, le=1000),
+    cursor: str = None,
+):
+    if limit is not None or cursor is not None:
+        return await _get_pay_raw_page(
+            billy_web=billy_web,
+            account_id=account_id,
+            wallet=wallet,
+            limit=limit or 100,
+            cursor=cursor,
+        )
+
+    if stream:
+        response = await billy_web._iter_wallet_pay_raw_data(
+            account_id=account_id, wallet=wallet
+        )
+    else:
+        response = await billy_web._get_wallet_pay_raw_data(
+            account_id=account_id, wallet=wallet
+        )
+    if response is BillyResponse.NOT_FOUND:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Wallet '{wallet}' not found.",
+        )
+    if stream:
+        return _stream_json_response(
+            message=f" {wallet} wallet data retrieved successfully.",
+            batches=response,
+        )
+    return JSONResponse(
+        status_code=200,
+        content={
+            "status": "success",
+            "message": f" {wallet} wallet data retrieved successfully.",
+            "data": response,
+        },
+    )
+
+
+async def _get_pay_raw_page(
+    billy_web: BillyWeb, account_id: str, wallet: str, limit: int, cursor: str
+):
+    response, next_cursor = await billy_web._get_wallet_pay_raw_page(
+        account_id=account_id, wallet=wallet, limit=limit, cursor=cursor
+    )
+    if response is BillyResponse.BAD_REQUEST:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid cursor.",
+        )
     if response is BillyResponse.NOT_FOUND:
         raise HTTPException(
             status_code=404,
@@ -56,13 +140,14 @@ def get_pay_raw(account_id: str, wallet: str):
             "status": "success",
             "message": f" {wallet} wallet data retrieved successfully.",
             "data": response,
+            "next_cursor": next_cursor,
         },
     )
 
 
 @router.get("/get_wallets")
-def get_wallets(account_id: str):
-    response = billy_web._get_wallets(account_id=account_id)
+async def get_wallets(billy_web: BillyWebDependency, account_id: str):
+    response = await billy_web._get_wallets(account_id=account_id)
     return JSONResponse(
         status_code=200,
         content={
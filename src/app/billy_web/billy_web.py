@@ -1,69 +1,304 @@
 # Built-in imports
 import os
 import sys
+import json
+import asyncio
 from enum import Enum
 from datetime import datetime
-from typing import Annotated, Union
+from zoneinfo import ZoneInfo
+from typing import Annotated
 from dataclasses import dataclass, field
 
 # Third party imports
 import redis
-import psycopg2
-from fastapi import APIRouter, Depends, Request, HTTPException, File, UploadFile
-from fastapi.responses import Response, JSONResponse, FileResponse, StreamingResponse
+from psycopg_pool import AsyncConnectionPool
+from fastapi.responses import JSONResponse
 
 
 # Local imports
 from base.config import logger
 from base.exception import BillyResponse
 from utils.database import (
-    _get_table_data,
-    _insert,
+    _aget_table_data,
+    _aget_query_data,
+    _aget_table_page,
+    _aget_table_columns,
+    _iter_table_data,
+    _ainsert,
+    _ainsert_many,
+    _aexecute,
+    _aupsert_increment,
+    _anotify,
     _set_client_postgres,
+    _set_client_postgres_async,
+    _set_client_postgres_replicas,
+    _set_client_postgres_async_replicas,
+    _set_client_postgres_shards,
+    _postgres_shard,
+    _apostgres_session,
+    _apostgres_read_session,
     _check_postgres_connection,
     _set_client_redis,
     _check_redis_connection,
     _store_hashmap,
     _retrieve_hashmap,
+    _store_hash_field,
+    _retrieve_versioned_hash_field,
+    _increment_counters,
+)
+from utils.pool import PostgresPool, ReplicaSet
+from utils.migration import _check_migrations
+from utils.partition import _ensure_pay_partitions
+from utils.shard import ShardMap, _parse_shards
+from utils.cache import TTLCache
+from utils.change_feed import CHANGE_FEED_CHANNEL, ChangeFeedListener
+from utils.aggregation import (
+    _aggregate_wallet_pay_data,
+    _filter_wallet_months,
+    _attach_wallet_pay_data,
+    _month_range_to_datetimes,
 )
 from utils.utils import (
     _generate_unique_id,
     _generate_timestamp_now,
-    _make_a_request_to_api,
+    _to_naive_datetime,
+    _encode_cursor,
+    _decode_cursor,
 )
 
 REDIS_TELEGRAM_DIR = os.getenv("REDIS_TELEGRAM_DIR")
 BOT_EXPIRE_LOGGED_TIME = int(os.getenv("BOT_EXPIRE_LOGGED_TIME"))
 
+# A statement run this many times on a connection becomes a server-side
+# prepared statement, up to POSTGRES_PREPARED_MAX per connection (LRU). "off"
+# disables them, e.g. behind a transaction-pooling pgbouncer.
+POSTGRES_PREPARE_THRESHOLD = os.getenv("POSTGRES_PREPARE_THRESHOLD", "5")
+POSTGRES_PREPARED_MAX = int(os.getenv("POSTGRES_PREPARED_MAX", 100))
+
+# Computed /wallet/get_pay results in Redis, one hash per (account, wallet).
+# Every pay write bumps the pair's version, entries of older versions are
+# ignored and expire after WALLET_SUMMARY_CACHE_TTL seconds (0 disables).
+REDIS_WALLET_SUMMARY_DIR = "wallet_summary"
+WALLET_SUMMARY_CACHE_TTL = int(os.getenv("WALLET_SUMMARY_CACHE_TTL", 3600))
+
+# Months of pay partitions kept ahead of today. They are created on startup
+# and then every POSTGRES_PAY_PARTITIONS_INTERVAL seconds, so long-running
+# workers don't run past them.
+POSTGRES_PAY_PARTITIONS_AHEAD = int(os.getenv("POSTGRES_PAY_PARTITIONS_AHEAD", 3))
+POSTGRES_PAY_PARTITIONS_INTERVAL = float(
+    os.getenv("POSTGRES_PAY_PARTITIONS_INTERVAL", 3600)
+)
+
+# pay.created_at is a TIMESTAMP without time zone. Offset-aware values are
+# converted to wall-clock time in this zone before they are stored and rolled
+# up, so both agree on the month regardless of the session TimeZone.
+PAY_TIMEZONE = ZoneInfo(os.getenv("PAY_TIMEZONE") or "UTC")
+
+# Per (account, wallet, month) totals of active pay rows, kept in sync on write
+WALLET_ROLLUP_TABLE = "wallet_monthly_rollup"
+
+# Columns of raw pay rows. Selected explicitly: prepared statements of
+# `SELECT pay.*` break when a migration adds a column (e.g. 0004)
+PAY_COLUMNS = [
+    "pay.pay_id",
+    "pay.wallet",
+    "pay.flow",
+    "pay.created_at",
+    "pay.description",
+    "pay.issued",
+    "pay.active",
+]
+
+# Pay rows of an account are found through account_pay, or through the
+# denormalized pay.account_id when the optional 0004 migration is applied
+ACCOUNT_PAY_JOIN = {"account_pay": "account_pay.pay_id = pay.pay_id"}
+
+# Monthly IN/OUT totals with the carried-forward balance as a window function,
+# formatted with the owner filter of `BillyWeb.__pay_owner_filter`
+WALLET_SUMMARY_QUERY = """
+    SELECT
+        EXTRACT(YEAR FROM month_start)::INTEGER AS year,
+        EXTRACT(MONTH FROM month_start)::INTEGER AS month,
+        total_in,
+        total_out,
+        SUM(total_in - total_out) OVER (ORDER BY month_start) AS ready_to_spend
+    FROM (
+        SELECT
+            date_trunc('month', pay.created_at) AS month_start,
+            COALESCE(SUM(pay.issued) FILTER (WHERE pay.flow = 'IN'), 0) AS total_in,
+            COALESCE(SUM(pay.issued) FILTER (WHERE pay.flow = 'OUT'), 0) AS total_out
+        FROM pay{owner_join}
+        WHERE {owner_column} = %s
+            AND pay.wallet = %s
+            AND pay.active = true
+        GROUP BY 1
+    ) AS monthly
+    ORDER BY month_start;
+"""
+
+# Deactivates an active pay of the account. Concurrent calls serialize on the
+# row lock and only the first one gets the row back.
+DEACTIVATE_PAY_QUERY = """
+    UPDATE pay
+    SET active = false
+    FROM account_pay
+    WHERE account_pay.pay_id = pay.pay_id
+        AND account_pay.account_id = %s
+        AND pay.pay_id = %s
+        AND pay.active = true
+    RETURNING pay.wallet, pay.flow, pay.issued, pay.created_at;
+"""
+
 
 @dataclass(frozen=False, kw_only=False, match_args=False, slots=False)
 class BillyWeb:
     config: dict = field(default_factory=dict)
 
     _beared_token: str = field(init=False, repr=False)
-    _postgres_connection: str = field(init=False, repr=False)
-    _postgres_cursor: str = field(init=False, repr=False)
+    _postgres_pool: PostgresPool = field(init=False, repr=False)
+    _postgres_async_pool: AsyncConnectionPool = field(init=False, repr=False)
+    _postgres_replicas: ReplicaSet = field(init=False, repr=False)
+    _postgres_async_replicas: ReplicaSet = field(init=False, repr=False)
+    _postgres_shard_pools: dict = field(init=False, repr=False)
+    _postgres_async_shard_pools: dict = field(init=False, repr=False)
+    _shard_map: ShardMap = field(init=False, repr=False)
+    _wallets_cache: TTLCache = field(init=False, repr=False)
+    _change_feeds: list = field(init=False, repr=False)
+    _partitions_task: asyncio.Task = field(init=False, repr=False)
     _redis_connection: str = field(init=False, repr=False)
     _post: str = field(init=False, repr=False)
     _default_wallets: list = field(init=False, repr=False)
 
     def __post_init__(self) -> None:
-        # Create postgres connection
-        self._postgres_connection = psycopg2.connect(
+        # Create postgres connection pool
+        self._postgres_pool = PostgresPool(
+            minconn=int(os.getenv("POSTGRES_POOL_MIN", 1)),
+            maxconn=int(os.getenv("POSTGRES_POOL_MAX", 10)),
+            timeout=float(os.getenv("POSTGRES_POOL_TIMEOUT", 30)),
+            healthcheck_after=float(os.getenv("POSTGRES_POOL_HEALTHCHECK_AFTER", 30)),
             dbname=os.getenv("POSTGRES_DBNAME"),
             user=os.getenv("POSTGRES_USER"),
             password=os.getenv("POSTGRES_PASSWORD"),
             host=os.getenv("POSTGRES_HOST"),
             port=os.getenv("POSTGRES_PORT"),
         )
-        self._postgres_cursor = self._postgres_connection.cursor()
-        _set_client_postgres(
-            postgres_connection=self._postgres_connection,
-            postgres_cursor=self._postgres_cursor,
-        )
+        _set_client_postgres(postgres_pool=self._postgres_pool)
         if not _check_postgres_connection():
             logger.error("PostgreSQL connection failed. Exiting...")
             sys.exit(1)
+        if not _check_migrations():
+            logger.error("PostgreSQL schema is not up to date. Exiting...")
+            sys.exit(1)
+        _ensure_pay_partitions(months_ahead=POSTGRES_PAY_PARTITIONS_AHEAD)
+
+        # Async pool serves the request handlers, it is opened on app startup
+        self._postgres_async_pool = AsyncConnectionPool(
+            min_size=int(os.getenv("POSTGRES_POOL_MIN", 1)),
+            max_size=int(os.getenv("POSTGRES_POOL_MAX", 10)),
+            timeout=float(os.getenv("POSTGRES_POOL_TIMEOUT", 30)),
+            check=AsyncConnectionPool.check_connection,
+            configure=self._configure_postgres_connection,
+            kwargs={
+                "dbname": os.getenv("POSTGRES_DBNAME"),
+                "user": os.getenv("POSTGRES_USER"),
+                "password": os.getenv("POSTGRES_PASSWORD"),
+                "host": os.getenv("POSTGRES_HOST"),
+                "port": os.getenv("POSTGRES_PORT"),
+            },
+            open=False,
+        )
+        _set_client_postgres_async(postgres_async_pool=self._postgres_async_pool)
+
+        # Optional read replicas (comma-separated DSNs) for read-only helpers.
+        # They may be down at startup, so no connection is opened eagerly.
+        replica_dsns = [
+            dsn.strip()
+            for dsn in os.getenv("POSTGRES_REPLICA_DSNS", "").split(",")
+            if dsn.strip()
+        ]
+        replica_timeout = float(os.getenv("POSTGRES_REPLICA_TIMEOUT", 2))
+        replica_retry_after = float(os.getenv("POSTGRES_REPLICA_RETRY_AFTER", 30))
+        self._postgres_replicas = ReplicaSet(
+            pools=[
+                PostgresPool(
+                    minconn=0,
+                    maxconn=int(os.getenv("POSTGRES_POOL_MAX", 10)),
+                    timeout=replica_timeout,
+                    healthcheck_after=float(
+                        os.getenv("POSTGRES_POOL_HEALTHCHECK_AFTER", 30)
+                    ),
+                    dsn=dsn,
+                )
+                for dsn in replica_dsns
+            ],
+            retry_after=replica_retry_after,
+        )
+        self._postgres_async_replicas = ReplicaSet(
+            pools=[
+                AsyncConnectionPool(
+                    conninfo=dsn,
+                    min_size=int(os.getenv("POSTGRES_POOL_MIN", 1)),
+                    max_size=int(os.getenv("POSTGRES_POOL_MAX", 10)),
+                    timeout=replica_timeout,
+                    check=AsyncConnectionPool.check_connection,
+                    configure=self._configure_postgres_connection,
+                    kwargs={"autocommit": True},
+                    open=False,
+                )
+                for dsn in replica_dsns
+            ],
+            retry_after=replica_retry_after,
+        )
+        _set_client_postgres_replicas(postgres_replicas=self._postgres_replicas)
+        _set_client_postgres_async_replicas(
+            postgres_async_replicas=self._postgres_async_replicas
+        )
+
+        # Optional account shards (`name=dsn,...`). An account, its pays and
+        # rollups live on the shard its `account_id` hashes to; without shards
+        # everything stays on the POSTGRES_* database.
+        shard_dsns = _parse_shards(os.getenv("POSTGRES_SHARDS"))
+        self._postgres_shard_pools = {
+            shard: PostgresPool(
+                minconn=int(os.getenv("POSTGRES_POOL_MIN", 1)),
+                maxconn=int(os.getenv("POSTGRES_POOL_MAX", 10)),
+                timeout=float(os.getenv("POSTGRES_POOL_TIMEOUT", 30)),
+                healthcheck_after=float(
+                    os.getenv("POSTGRES_POOL_HEALTHCHECK_AFTER", 30)
+                ),
+                dsn=dsn,
+            )
+            for shard, dsn in shard_dsns.items()
+        }
+        self._postgres_async_shard_pools = {
+            shard: AsyncConnectionPool(
+                conninfo=dsn,
+                min_size=int(os.getenv("POSTGRES_POOL_MIN", 1)),
+                max_size=int(os.getenv("POSTGRES_POOL_MAX", 10)),
+                timeout=float(os.getenv("POSTGRES_POOL_TIMEOUT", 30)),
+                check=AsyncConnectionPool.check_connection,
+                configure=self._configure_postgres_connection,
+                open=False,
+            )
+            for shard, dsn in shard_dsns.items()
+        }
+        _set_client_postgres_shards(
+            postgres_pools=self._postgres_shard_pools,
+            postgres_async_pools=self._postgres_async_shard_pools,
+        )
+        for shard in shard_dsns:
+            with _postgres_shard(shard):
+                if not _check_postgres_connection():
+                    logger.error(f"PostgreSQL shard '{shard}' failed. Exiting...")
+                    sys.exit(1)
+                if not _check_migrations():
+                    logger.error(
+                        f"PostgreSQL shard '{shard}' schema is not up to date. "
+                        "Exiting..."
+                    )
+                    sys.exit(1)
+                _ensure_pay_partitions(months_ahead=POSTGRES_PAY_PARTITIONS_AHEAD)
+        self._shard_map = ShardMap(list(shard_dsns)) if shard_dsns else None
 
         # Create redis connection
         self._redis_connection = redis.Redis(
@@ -79,6 +314,36 @@ class BillyWeb:
             logger.error("Redis connection failed. Exiting...")
             sys.exit(1)
 
+        # Per-process cache of account wallet lists
+        self._wallets_cache = TTLCache(
+            maxsize=int(os.getenv("WALLETS_CACHE_SIZE", 10000)),
+            ttl=float(os.getenv("WALLETS_CACHE_TTL", 300)),
+        )
+
+        # Other workers' writes evict this process' caches, one listener per
+        # database since notifications don't cross databases
+        self._change_feeds = []
+        if os.getenv("POSTGRES_CHANGE_FEED", "true").lower() == "true":
+            self._change_feeds.append(
+                ChangeFeedListener(
+                    on_change=self._on_change_event,
+                    on_reset=self._on_change_feed_reset,
+                    dbname=os.getenv("POSTGRES_DBNAME"),
+                    user=os.getenv("POSTGRES_USER"),
+                    password=os.getenv("POSTGRES_PASSWORD"),
+                    host=os.getenv("POSTGRES_HOST"),
+                    port=os.getenv("POSTGRES_PORT"),
+                )
+            )
+            self._change_feeds.extend(
+                ChangeFeedListener(
+                    on_change=self._on_change_event,
+                    on_reset=self._on_change_feed_reset,
+                    conninfo=dsn,
+                )
+                for dsn in shard_dsns.values()
+            )
+
         # # Account informations
         # self._account_id = None
         # self._beared_token = None
@@ -90,6 +355,65 @@ class BillyWeb:
             "daily_needs",
         ]
 
+    async def _configure_postgres_connection(self, connection) -> None:
+        # Called by the async pools on every new connection
+        if POSTGRES_PREPARE_THRESHOLD.lower() == "off":
+            connection.prepare_threshold = None
+        else:
+            connection.prepare_threshold = int(POSTGRES_PREPARE_THRESHOLD)
+        connection.prepared_max = POSTGRES_PREPARED_MAX
+
+    async def _startup(self) -> None:
+        await self._postgres_async_pool.open(wait=True)
+        logger.success("PostgreSQL async pool is open.")
+        # Replicas connect in the background, a down one is just skipped
+        for pool in self._postgres_async_replicas.pools:
+            await pool.open()
+        if self._postgres_async_replicas:
+            logger.info(
+                f"Routing reads to {len(self._postgres_async_replicas)} replica(s)."
+            )
+        for pool in self._postgres_async_shard_pools.values():
+            await pool.open(wait=True)
+        if self._shard_map is not None:
+            logger.success(f"PostgreSQL shards are open: {self._shard_map.shards}")
+        for change_feed in self._change_feeds:
+            await change_feed.start()
+        self._partitions_task = asyncio.create_task(self.__maintain_pay_partitions())
+
+    async def _shutdown(self) -> None:
+        self._partitions_task.cancel()
+        try:
+            await self._partitions_task
+        except asyncio.CancelledError:
+            pass
+        for change_feed in self._change_feeds:
+            await change_feed.stop()
+        for pool in self._postgres_async_shard_pools.values():
+            await pool.close()
+        for pool in self._postgres_shard_pools.values():
+            pool.closeall()
+        for pool in self._postgres_async_replicas.pools:
+            await pool.close()
+        for pool in self._postgres_replicas.pools:
+            pool.closeall()
+        await self._postgres_async_pool.close()
+        self._postgres_pool.closeall()
+
+    def __ensure_pay_partitions(self) -> None:
+        # The default database, then every account shard
+        for shard in [None, *self._postgres_shard_pools]:
+            with _postgres_shard(shard):
+                _ensure_pay_partitions(months_ahead=POSTGRES_PAY_PARTITIONS_AHEAD)
+
+    async def __maintain_pay_partitions(self) -> None:
+        while True:
+            await asyncio.sleep(POSTGRES_PAY_PARTITIONS_INTERVAL)
+            try:
+                await asyncio.to_thread(self.__ensure_pay_partitions)
+            except Exception as e:
+                logger.error(f"Failed to maintain pay partitions: {e}")
+
     # def __get_beared_token(self, username: str, password: str) -> str:
     #     status_code, response = _make_a_request_to_api(
     #         route="/user/token",
@@ -127,17 +451,35 @@ class BillyWeb:
                 },
             )
 
-    def _check_account_by_email(self, email: str) -> bool:
+    def _shard_for(self, account_id: str) -> str:
+        # Shard owning the account, None (default database) when not sharded
+        if self._shard_map is None:
+            return None
+        return self._shard_map.shard_for(account_id)
+
+    async def __get_accounts_by_email(self, email: str) -> list:
+        # Accounts are sharded by account_id, so an email lookup asks every shard
+        async def get_accounts(shard: str) -> list:
+            with _postgres_shard(shard):
+                return await _aget_table_data(
+                    table_name="account",
+                    condition={"email": email},
+                    columns=["account_id"],
+                    limit=1,
+                )
+
+        shards = self._shard_map.shards if self._shard_map is not None else [None]
+        results = await asyncio.gather(*(get_accounts(shard) for shard in shards))
+        return [account for accounts in results for account in accounts]
+
+    async def _check_account_by_email(self, email: str) -> bool:
         # Retrieve data from 'account' table
-        account_data = _get_table_data(
-            table_name="account",
-            condition={"email": email},
-        )
+        account_data = await self.__get_accounts_by_email(email=email)
         if not account_data:
             return False
         return True
 
-    def _register_account(
+    async def _register_account(
         self,
         full_name: str,
         email: str,
@@ -145,21 +487,25 @@ class BillyWeb:
         password: str,
         pin: str,
     ) -> dict:
-        _insert(
-            table_name="account",
-            data={
-                "account_id": _generate_unique_id(),
-                "full_name": full_name,
-                "email": email,
-                "telp": telp,
-                "password": password,
-                "pin": pin,
-                "wallets": self._default_wallets,
-                "created_at": _generate_timestamp_now(),
-            },
-        )
+        account_id = _generate_unique_id()
+        with _postgres_shard(self._shard_for(account_id)):
+            async with _apostgres_session():
+                await _ainsert(
+                    table_name="account",
+                    data={
+                        "account_id": account_id,
+                        "full_name": full_name,
+                        "email": email,
+                        "telp": telp,
+                        "password": password,
+                        "pin": pin,
+                        "wallets": self._default_wallets,
+                        "created_at": _generate_timestamp_now(),
+                    },
+                )
+                await self.__publish_change(table="account", account_id=account_id)
 
-    def _insert_pay_data(
+    async def _insert_pay_data(
         self,
         account_id: str,
         wallet: str,
@@ -167,142 +513,574 @@ class BillyWeb:
         description: str,
         issued: float,
         created_at: datetime,
+    ) -> str:
+        pay_ids = await self._insert_pay_datas(
+            account_id=account_id,
+            pays=[
+                {
+                    "wallet": wallet,
+                    "flow": flow,
+                    "description": description,
+                    "issued": issued,
+                    "created_at": created_at,
+                }
+            ],
+        )
+        return pay_ids[0]
+
+    async def _insert_pay_datas(self, account_id: str, pays: list) -> list:
+        # Build rows for 'pay' and 'account_pay' tables
+        pay_rows = []
+        account_pay_rows = []
+        for pay in pays:
+            flow = pay["flow"]
+            pay_id = _generate_unique_id()
+            pay_rows.append(
+                {
+                    "pay_id": pay_id,
+                    "wallet": pay["wallet"],
+                    "flow": flow.value if isinstance(flow, Enum) else flow,
+                    "created_at": _to_naive_datetime(pay["created_at"], PAY_TIMEZONE),
+                    "description": pay["description"],
+                    "issued": pay["issued"],
+                    "active": True,
+                }
+            )
+            account_pay_rows.append({"account_id": account_id, "pay_id": pay_id})
+
+        with _postgres_shard(self._shard_for(account_id)):
+            # Write both tables and the monthly rollup in one transaction.
+            # account_pay goes first: with the optional 0004 migration a
+            # trigger copies the owner from it onto each inserted pay.
+            async with _apostgres_session():
+                await _ainsert_many(table_name="account_pay", datas=account_pay_rows)
+                await _ainsert_many(table_name="pay", datas=pay_rows)
+                await self.__apply_wallet_rollup(
+                    account_id=account_id, pays=pay_rows, sign=1
+                )
+                await self.__publish_change(
+                    table="pay",
+                    account_id=account_id,
+                    wallets=sorted({row["wallet"] for row in pay_rows}),
+                )
+
+        # Committed above, so this must not run inside a caller's session
+        await self.__invalidate_wallet_summaries(
+            account_id=account_id, wallets=[row["wallet"] for row in pay_rows]
+        )
+        return [row["pay_id"] for row in pay_rows]
+
+    async def __apply_wallet_rollup(
+        self, account_id: str, pays: list, sign: int
     ) -> None:
-        # Insert 'pay' table
-        pay_id = _generate_unique_id()
-        _insert(
-            table_name="pay",
-            data={
-                "pay_id": pay_id,
-                "wallet": wallet,
-                "flow": flow,
-                "created_at": created_at,
-                "description": description,
-                "issued": issued,
-                "active": True,
-            },
+        # Aggregate per (wallet, year, month) first, a single upsert statement
+        # can't touch the same rollup row twice
+        rollups = {}
+        for pay in pays:
+            created_at = pay["created_at"]
+            if isinstance(created_at, str):
+                created_at = datetime.fromisoformat(created_at)
+            key = (pay["wallet"], created_at.year, created_at.month)
+            if key not in rollups:
+                rollups[key] = {
+                    "account_id": account_id,
+                    "wallet": key[0],
+                    "year": key[1],
+                    "month": key[2],
+                    "total_in": 0,
+                    "total_out": 0,
+                    "pay_count": 0,
+                }
+            rollup = rollups[key]
+            if pay["flow"] == "IN":
+                rollup["total_in"] += sign * pay["issued"]
+            elif pay["flow"] == "OUT":
+                rollup["total_out"] += sign * pay["issued"]
+            rollup["pay_count"] += sign
+
+        # Rows are locked in the order they are upserted, a fixed order keeps
+        # concurrent writes to the same account from deadlocking
+        await _aupsert_increment(
+            table_name=WALLET_ROLLUP_TABLE,
+            conflict_columns=["account_id", "wallet", "year", "month"],
+            datas=[rollups[key] for key in sorted(rollups)],
         )
 
-        # Insert 'account_pay' table
-        _insert(
-            table_name="account_pay",
-            data={
-                "account_id": account_id,
-                "pay_id": pay_id,
-            },
+    async def _deactivate_pay_data(
+        self, account_id: str, pay_id: str
+    ) -> BillyResponse:
+        with _postgres_shard(self._shard_for(account_id)):
+            async with _apostgres_session():
+                pay_data = await _aexecute(
+                    query=DEACTIVATE_PAY_QUERY, values=(account_id, pay_id)
+                )
+                if not pay_data:
+                    return BillyResponse.NOT_FOUND
+
+                await self.__apply_wallet_rollup(
+                    account_id=account_id, pays=pay_data, sign=-1
+                )
+                await self.__publish_change(
+                    table="pay", account_id=account_id, wallets=[pay_data[0]["wallet"]]
+                )
+
+        await self.__invalidate_wallet_summaries(
+            account_id=account_id, wallets=[pay_data[0]["wallet"]]
+        )
+        return BillyResponse.SUCCESS
+
+    async def _insert_pay_batch(self, account_id: str, pays: list) -> list:
+        with _postgres_shard(self._shard_for(account_id)):
+            account_data = await _aget_table_data(
+                table_name="account",
+                condition={"account_id": account_id},
+                columns=["wallets"],
+                limit=1,
+            )
+        if not account_data:
+            return BillyResponse.NOT_FOUND
+        wallets = account_data[0].get("wallets", [])
+
+        # Validate every item, only valid ones are written
+        results = []
+        valid_pays = []
+        for index, pay in enumerate(pays):
+            wallet = pay["wallet"].lower()
+            if wallet not in wallets:
+                results.append(
+                    {
+                        "index": index,
+                        "status": "error",
+                        "message": f"Wallet '{pay['wallet']}' not found.",
+                    }
+                )
+                continue
+            results.append({"index": index, "status": "success"})
+            valid_pays.append({**pay, "wallet": wallet})
+
+        # Its own transaction, caches are invalidated once it's committed
+        pay_ids = iter(
+            await self._insert_pay_datas(account_id=account_id, pays=valid_pays)
         )
 
-    def __get_account_wallets(self, account_id: str) -> list:
-        # Retrieve data from 'account' table
-        account_data = _get_table_data(
-            table_name="account",
-            condition={"account_id": account_id},
+        for result in results:
+            if result["status"] == "success":
+                result["pay_id"] = next(pay_ids)
+        logger.debug(
+            "Inserted {}/{} pays for {}", len(valid_pays), len(pays), account_id
         )
+        return results
+
+    async def __get_account_wallets(self, account_id: str) -> list:
+        # Wallet lists barely change, most lookups never reach the database
+        wallets = self._wallets_cache.get(account_id)
+        if wallets is not None:
+            return wallets
+
+        with _postgres_shard(self._shard_for(account_id)):
+            # Retrieve data from 'account' table
+            account_data = await _aget_table_data(
+                table_name="account",
+                condition={"account_id": account_id},
+                columns=["wallets"],
+                limit=1,
+            )
 
         # Extract wallets from the account data
         wallets = account_data[0].get("wallets", [])
-        logger.debug(f"Retrieved wallets for account {account_id}: {wallets}")
+        self._wallets_cache.set(account_id, wallets)
+        logger.debug("Retrieved wallets for account {}: {}", account_id, wallets)
         return wallets
 
-    def __get_pay_ids_from_account_id(self, account_id: str) -> list:
-        # Retrieve data from 'account_pay' table
-        account_pay_ids = _get_table_data(
-            table_name="account_pay",
-            condition={"account_id": account_id},
+    def _invalidate_account_cache(self, account_id: str) -> None:
+        # Must follow every write to an account row (e.g. its wallets)
+        self._wallets_cache.invalidate(account_id)
+
+    async def __publish_change(self, table: str, account_id: str, **details) -> None:
+        # Joins the caller's session, listeners get it once that commits
+        await _anotify(
+            CHANGE_FEED_CHANNEL, {"table": table, "account_id": account_id, **details}
         )
-        pay_ids = [account_pay_id["pay_id"] for account_pay_id in account_pay_ids]
-        logger.debug(f"Retrieved pay IDs for account {account_id}: {pay_ids}")
-        return pay_ids
 
-    def _get_wallet_pay_raw_data(self, account_id: str, wallet: str) -> dict:
+    def _on_change_event(self, event: dict) -> None:
+        # Pay events carry the wallets written to, nothing in process caches
+        # pay data yet
+        if event.get("table") == "account":
+            self._invalidate_account_cache(event["account_id"])
+
+    def _on_change_feed_reset(self) -> None:
+        # Events may have been missed while the listener was disconnected
+        self._wallets_cache.clear()
+
+    async def __pay_owner_filter(self, account_id: str) -> tuple:
+        # (condition, join) selecting the account's pay rows, run in its shard.
+        # 0004 adds pay.account_id already NOT NULL and trigger-filled, in one
+        # transaction, so any worker seeing the column can rely on it.
+        if "account_id" in await _aget_table_columns("pay"):
+            return {"pay.account_id": account_id}, None
+        return {"account_pay.account_id": account_id}, ACCOUNT_PAY_JOIN
+
+    async def _get_wallet_pay_raw_data(
+        self,
+        account_id: str,
+        wallet: str,
+        start: datetime = None,
+        end: datetime = None,
+    ) -> dict:
         # Normalize wallet name to lowercase (ensure non-sensitive case)
         wallet = wallet.lower()
-        # Check if the account has the specified wallet
-        wallets = self.__get_account_wallets(account_id=account_id)
-        if wallet not in wallets:
-            return BillyResponse.NOT_FOUND
+        with _postgres_shard(self._shard_for(account_id)):
+            async with _apostgres_read_session():
+                # Check if the account has the specified wallet
+                wallets = await self.__get_account_wallets(account_id=account_id)
+                if wallet not in wallets:
+                    return BillyResponse.NOT_FOUND
 
-        pay_ids = self.__get_pay_ids_from_account_id(account_id)
-        # Check if there no pay IDs associated with the account
-        if not pay_ids:
-            return []
+                # Optional created_at range, `end` is exclusive
+                owner_condition, join = await self.__pay_owner_filter(account_id)
+                condition = {
+                    **owner_condition,
+                    "pay.wallet": wallet,
+                    "pay.active": True,
+                }
+                if start is not None:
+                    condition["pay.created_at >="] = start
+                if end is not None:
+                    condition["pay.created_at <"] = end
 
-        # Retrieve data from 'pay' table
-        datas = _get_table_data(
-            table_name="pay",
-            condition={"pay_id": pay_ids, "wallet": wallet, "active": True},
-            order_by="created_at",
-        )
+                # Retrieve data from 'pay' table of the account
+                datas = await _aget_table_data(
+                    table_name="pay",
+                    condition=condition,
+                    order_by="pay.created_at",
+                    join=join,
+                    columns=PAY_COLUMNS,
+                )
         return datas
 
-    def _get_wallet_pay_data(self, account_id: str, wallet: str) -> dict:
-        raw_datas = self._get_wallet_pay_raw_data(account_id=account_id, wallet=wallet)
-        if raw_datas is BillyResponse.NOT_FOUND:
-            return BillyResponse.NOT_FOUND
+    async def _get_wallet_pay_raw_page(
+        self, account_id: str, wallet: str, limit: int = 100, cursor: str = None
+    ):
+        # Decode the opaque cursor into (created_at, pay_id) of the last row
+        try:
+            after = _decode_cursor(cursor) if cursor else None
+            if after is not None:
+                created_at, pay_id = after
+                if not isinstance(created_at, str) or not isinstance(pay_id, str):
+                    raise ValueError(f"Invalid cursor: {cursor}")
+                datetime.fromisoformat(created_at)
+        except ValueError:
+            return BillyResponse.BAD_REQUEST, None
 
-        results = {}
-        for data in raw_datas:
-            pay_id = data["pay_id"]
-            wallet = data["wallet"]
-            flow = data["flow"]
-            created_at = datetime.fromisoformat(data["created_at"])
-            description = data["description"]
-            issued = data["issued"]
-            active = data["active"]
-
-            # Initialize the results structure if not already present
-            if created_at.year not in results:
-                results[created_at.year] = {}
-            if created_at.month not in results[created_at.year]:
-                results[created_at.year][created_at.month] = {
-                    "BUDGET": 0,
-                    "IN": {"data": [], "total": 0},
-                    "OUT": {"data": [], "total": 0},
-                    "READY_TO_SPEND": 0,
+        # Normalize wallet name to lowercase (ensure non-sensitive case)
+        wallet = wallet.lower()
+        with _postgres_shard(self._shard_for(account_id)):
+            async with _apostgres_read_session():
+                # Check if the account has the specified wallet
+                wallets = await self.__get_account_wallets(account_id=account_id)
+                if wallet not in wallets:
+                    return BillyResponse.NOT_FOUND, None
+
+                owner_condition, join = await self.__pay_owner_filter(account_id)
+                condition = {
+                    **owner_condition,
+                    "pay.wallet": wallet,
+                    "pay.active": True,
                 }
+                if after is not None:
+                    # Implied by the keyset, but only a plain range on the
+                    # partition key lets Postgres skip older pay partitions
+                    condition["pay.created_at >="] = after[0]
+
+                # Page through the account's 'pay' rows by (created_at, pay_id)
+                datas, next_after = await _aget_table_page(
+                    table_name="pay",
+                    keyset=["pay.created_at", "pay.pay_id"],
+                    condition=condition,
+                    join=join,
+                    after=after,
+                    limit=limit,
+                    columns=PAY_COLUMNS,
+                )
+
+        next_cursor = _encode_cursor(next_after) if next_after else None
+        return datas, next_cursor
+
+    async def _iter_wallet_pay_raw_data(self, account_id: str, wallet: str):
+        # Normalize wallet name to lowercase (ensure non-sensitive case)
+        wallet = wallet.lower()
+        with _postgres_shard(self._shard_for(account_id)):
+            # Check if the account has the specified wallet
+            wallets = await self.__get_account_wallets(account_id=account_id)
+            if wallet not in wallets:
+                return BillyResponse.NOT_FOUND
+
+            # Stream the account's 'pay' rows, a batch at a time
+            owner_condition, join = await self.__pay_owner_filter(account_id)
+            return _iter_table_data(
+                table_name="pay",
+                condition={
+                    **owner_condition,
+                    "pay.wallet": wallet,
+                    "pay.active": True,
+                },
+                order_by="pay.created_at",
+                join=join,
+                columns=PAY_COLUMNS,
+            )
 
-            # Create a data entry for the current pay record
-            if flow == "IN":
-                results[created_at.year][created_at.month]["IN"]["data"].append(data)
-                results[created_at.year][created_at.month]["IN"]["total"] += issued
-            elif flow == "OUT":
-                results[created_at.year][created_at.month]["OUT"]["data"].append(data)
-                results[created_at.year][created_at.month]["OUT"]["total"] += issued
+    async def _get_wallet_pay_summary(self, account_id: str, wallet: str) -> dict:
+        # Normalize wallet name to lowercase (ensure non-sensitive case)
+        wallet = wallet.lower()
+        with _postgres_shard(self._shard_for(account_id)):
+            async with _apostgres_read_session():
+                # Check if the account has the specified wallet
+                wallets = await self.__get_account_wallets(account_id=account_id)
+                if wallet not in wallets:
+                    return BillyResponse.NOT_FOUND
 
-        # Setting up BUDGET and READY_TO_SPEND
-        # Sort years and months for correct chronological order
+                rollups = await _aget_table_data(
+                    table_name=WALLET_ROLLUP_TABLE,
+                    condition={"account_id": account_id, "wallet": wallet},
+                    order_by="year, month",
+                    columns=["year", "month", "total_in", "total_out", "pay_count"],
+                )
+
+        # Same shape as `_get_wallet_pay_data`, without the raw rows
+        results = {}
         prev_budget = 0
-        for year in results.keys():
-            for month in results[year]:
-                data = results[year][month]
-
-                data["BUDGET"] = prev_budget
-                # Calculate READY_TO_SPEND as BUDGET + IN - OUT
-                data["READY_TO_SPEND"] = (
-                    data["BUDGET"] + data["IN"]["total"] - data["OUT"]["total"]
+        for rollup in rollups:
+            if rollup["pay_count"] <= 0:
+                continue
+            ready_to_spend = prev_budget + rollup["total_in"] - rollup["total_out"]
+            results.setdefault(rollup["year"], {})[rollup["month"]] = {
+                "BUDGET": prev_budget,
+                "IN": {"total": rollup["total_in"]},
+                "OUT": {"total": rollup["total_out"]},
+                "READY_TO_SPEND": ready_to_spend,
+            }
+            prev_budget = ready_to_spend
+
+        return results
+
+    async def _get_wallet_pay_summary_sql(
+        self, account_id: str, wallet: str
+    ) -> dict:
+        # Normalize wallet name to lowercase (ensure non-sensitive case)
+        wallet = wallet.lower()
+        with _postgres_shard(self._shard_for(account_id)):
+            async with _apostgres_read_session():
+                # Check if the account has the specified wallet
+                wallets = await self.__get_account_wallets(account_id=account_id)
+                if wallet not in wallets:
+                    return BillyResponse.NOT_FOUND
+
+                # Aggregate months and running balance in the database
+                owner_condition, join = await self.__pay_owner_filter(account_id)
+                (owner_column,) = owner_condition
+                owner_join = "".join(
+                    f" JOIN {table} ON {on_clause}"
+                    for table, on_clause in (join or {}).items()
+                )
+                monthly_datas = await _aget_query_data(
+                    query=WALLET_SUMMARY_QUERY.format(
+                        owner_join=owner_join, owner_column=owner_column
+                    ),
+                    values=(account_id, wallet),
                 )
-                prev_budget = data["READY_TO_SPEND"]
 
+        # Same shape as `_get_wallet_pay_summary`
+        results = {}
+        for data in monthly_datas:
+            ready_to_spend = data["ready_to_spend"]
+            results.setdefault(data["year"], {})[data["month"]] = {
+                "BUDGET": ready_to_spend - (data["total_in"] - data["total_out"]),
+                "IN": {"total": data["total_in"]},
+                "OUT": {"total": data["total_out"]},
+                "READY_TO_SPEND": ready_to_spend,
+            }
         return results
 
-    def _get_wallets(self, account_id: str) -> list:
-        # Retrieve data from 'account' table
-        account_data = _get_table_data(
-            table_name="account",
-            condition={"account_id": account_id},
+    async def _get_wallet_pay_data(
+        self,
+        account_id: str,
+        wallet: str,
+        include_data: bool = True,
+        start_month: tuple = None,
+        end_month: tuple = None,
+        aggregate: str = "python",
+    ) -> dict:
+        """
+        Monthly IN/OUT totals with BUDGET/READY_TO_SPEND for a wallet.
+
+        `start_month`/`end_month` are inclusive (year, month) bounds. With
+        `include_data=False` only totals are returned, read from the monthly
+        rollup (or aggregated in SQL with `aggregate="sql"`), so no raw pay
+        row is loaded. Results are cached in Redis until the next pay write
+        to the wallet.
+        """
+        wallet = wallet.lower()
+        variant = f"{include_data}:{start_month}:{end_month}:{aggregate}"
+        version, results = await self.__get_cached_wallet_pay_data(
+            account_id=account_id, wallet=wallet, variant=variant
         )
+        if results is not None:
+            return results
 
-        # Extract wallets from the account data
-        wallets = account_data[0].get("wallets", [])
-        logger.debug(f"Retrieved wallets for account {account_id}: {wallets}")
-        return wallets
+        arguments = {
+            "account_id": account_id,
+            "wallet": wallet,
+            "include_data": include_data,
+            "start_month": start_month,
+            "end_month": end_month,
+            "aggregate": aggregate,
+        }
+        if version is None:
+            return await self.__compute_wallet_pay_data(**arguments)
+
+        # Cached results must not come from a lagging replica
+        with _postgres_shard(self._shard_for(account_id)):
+            async with _apostgres_session():
+                results = await self.__compute_wallet_pay_data(**arguments)
+        if results is not BillyResponse.NOT_FOUND:
+            await self.__cache_wallet_pay_data(
+                account_id=account_id,
+                wallet=wallet,
+                variant=variant,
+                version=version,
+                results=results,
+            )
+        return results
+
+    def __wallet_summary_keys(self, account_id: str, wallet: str) -> tuple:
+        key = f"{REDIS_WALLET_SUMMARY_DIR}:{account_id}:{wallet}"
+        return f"{key}:version", key
+
+    async def __get_cached_wallet_pay_data(
+        self, account_id: str, wallet: str, variant: str
+    ) -> tuple:
+        # (current version, cached results or None), version is None when the
+        # cache is disabled or unavailable
+        if WALLET_SUMMARY_CACHE_TTL <= 0:
+            return None, None
+        version_key, key = self.__wallet_summary_keys(account_id, wallet)
+        try:
+            version, value = await asyncio.to_thread(
+                _retrieve_versioned_hash_field,
+                version_key=version_key,
+                key=key,
+                field=variant,
+            )
+        except redis.RedisError as e:
+            logger.warning(f"Wallet summary cache unavailable: {e}")
+            return None, None
+
+        if value is None:
+            return version, None
+        cached = json.loads(value)
+        if cached["version"] != version:
+            return version, None
+        # JSON object keys are strings, years and months are ints
+        results = {
+            int(year): {int(month): data for month, data in months.items()}
+            for year, months in cached["data"].items()
+        }
+        return version, results
+
+    async def __cache_wallet_pay_data(
+        self, account_id: str, wallet: str, variant: str, version: int, results: dict
+    ) -> None:
+        _, key = self.__wallet_summary_keys(account_id, wallet)
+        try:
+            await asyncio.to_thread(
+                _store_hash_field,
+                key=key,
+                field=variant,
+                value=json.dumps({"version": version, "data": results}),
+                expire_seconds=WALLET_SUMMARY_CACHE_TTL,
+            )
+        except redis.RedisError as e:
+            logger.warning(f"Wallet summary cache unavailable: {e}")
+
+    async def __invalidate_wallet_summaries(self, account_id: str, wallets) -> None:
+        # Bump the versions once the write is committed, so readers ignore
+        # entries of older versions, and drop the hashes holding them
+        if WALLET_SUMMARY_CACHE_TTL <= 0:
+            return
+        version_keys, keys = [], []
+        for wallet in sorted(set(wallets)):
+            version_key, key = self.__wallet_summary_keys(account_id, wallet)
+            version_keys.append(version_key)
+            keys.append(key)
+        try:
+            await asyncio.to_thread(
+                _increment_counters, keys=version_keys, delete_keys=keys
+            )
+        except redis.RedisError as e:
+            logger.error(f"Failed to invalidate wallet summaries of {account_id}: {e}")
+
+    async def __compute_wallet_pay_data(
+        self,
+        account_id: str,
+        wallet: str,
+        include_data: bool,
+        start_month: tuple,
+        end_month: tuple,
+        aggregate: str,
+    ) -> dict:
+        # Whole history with raw rows, aggregated in Python
+        if (
+            include_data
+            and aggregate == "python"
+            and start_month is None
+            and end_month is None
+        ):
+            raw_datas = await self._get_wallet_pay_raw_data(
+                account_id=account_id, wallet=wallet
+            )
+            if raw_datas is BillyResponse.NOT_FOUND:
+                return BillyResponse.NOT_FOUND
+            return _aggregate_wallet_pay_data(raw_datas)
+
+        # Totals of every month, so BUDGET carries over from before the range
+        with _postgres_shard(self._shard_for(account_id)):
+            async with _apostgres_read_session():
+                if aggregate == "sql":
+                    results = await self._get_wallet_pay_summary_sql(
+                        account_id=account_id, wallet=wallet
+                    )
+                else:
+                    results = await self._get_wallet_pay_summary(
+                        account_id=account_id, wallet=wallet
+                    )
+                if results is BillyResponse.NOT_FOUND:
+                    return BillyResponse.NOT_FOUND
+                results = _filter_wallet_months(
+                    results, start=start_month, end=end_month
+                )
+                if not include_data:
+                    return results
+
+                # Raw rows of the requested months only
+                start, end = _month_range_to_datetimes(start_month, end_month)
+                raw_datas = await self._get_wallet_pay_raw_data(
+                    account_id=account_id, wallet=wallet, start=start, end=end
+                )
+            return _attach_wallet_pay_data(results, raw_datas)
 
-    def _validate_telegram_session(self, telegram_id: str) -> bool:
-        data = _retrieve_hashmap(
+    async def _get_wallets(self, account_id: str) -> list:
+        return await self.__get_account_wallets(account_id=account_id)
+
+    async def _validate_telegram_session(self, telegram_id: str) -> bool:
+        data = await asyncio.to_thread(
+            _retrieve_hashmap,
             key=f"{REDIS_TELEGRAM_DIR}:{telegram_id}",
         )
         logger.debug(
-            f"Retrieved data from Redis for key {REDIS_TELEGRAM_DIR}:{telegram_id}: {data}"
+            "Retrieved data from Redis for key {}:{}: {}",
+            REDIS_TELEGRAM_DIR,
+            telegram_id,
+            data,
         )
         if data is None:
             return BillyResponse.UNAUTHORIZED, None
@@ -310,12 +1088,9 @@ class BillyWeb:
         account_id = data.get("account_id")
         return BillyResponse.SUCCESS, account_id
 
-    def _validate_email_link(self, email: str, telegram_id: str) -> bool:
+    async def _validate_email_link(self, email: str, telegram_id: str) -> bool:
         # Retrieve data from 'account' table
-        account_data = _get_table_data(
-            table_name="account",
-            condition={"email": email},
-        )
+        account_data = await self.__get_accounts_by_email(email=email)
         if not account_data:
             return BillyResponse.NOT_FOUND
 
@@ -326,11 +1101,12 @@ class BillyWeb:
             "email": email,
         }
 
-        _store_hashmap(
+        await asyncio.to_thread(
+            _store_hashmap,
             key=key,
             data=data,
             expire_seconds=BOT_EXPIRE_LOGGED_TIME,
         )
 
-        logger.debug(f"Stored data in Redis for key {key}: {data}")
+        logger.debug("Stored data in Redis for key {}: {}", key, data)
         return BillyResponse.SUCCESS
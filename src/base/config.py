@@ -8,26 +8,34 @@ from datetime import datetime
 
 # Local imports
 from loguru import logger
-from app.billy_web import BillyWeb
 
 # ------------------------------- [LOGGER] -------------------------------
 LEVEL = os.getenv("LOG_LEVEL")
+ROTATION = os.getenv("LOG_ROTATION", "100 MB")
+RETENTION = os.getenv("LOG_RETENTION", "14 days")
 
+# Sinks are enqueued: request threads only put the record on a queue and a
+# background thread does the writing, `logger.complete()` waits for it to
+# catch up.
 logger.remove()  # Remove default logger configuration
-# Add new logger configuration to write to a file
+# Add new logger configuration to write to a file, created on the first message
+# rather than on import
 logger.add(
     f"logs/{LEVEL}_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.log",
     format="<yellow>[{time:YYYY-MM-DD HH:mm:ss:SSSS}]</yellow> [<level><b>{level}</b></level>] [<b>{file.path}:{line}</b>] [<b>{function}</b>] <level>{message}</level>",
     level=LEVEL,
+    delay=True,
+    rotation=ROTATION,
+    retention=RETENTION,
+    enqueue=True,
 )
 # Add new logger configuration to print to console
 logger.add(
     sys.stdout,
     format="<yellow>[{time:YYYY-MM-DD HH:mm:ss:SSSS}]</yellow> [<level><b>{level}</b></level>] [<b>{file.path}:{line}</b>] [<b>{function}</b>] <level>{message}</level>",
     level=LEVEL,
+    enqueue=True,
 )
 
 
-# ------------------------------- [APP] -------------------------------
-billy_web = BillyWeb()
 # ------------------------------- [RESPONSE ERROR] -------------------------------
@@ -0,0 +1,27 @@
+-- Base tables. IF NOT EXISTS keeps this safe on databases created by hand.
+CREATE TABLE IF NOT EXISTS account (
+    account_id TEXT PRIMARY KEY,
+    full_name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    telp TEXT,
+    password TEXT NOT NULL,
+    pin TEXT,
+    wallets TEXT[] NOT NULL DEFAULT '{}',
+    created_at TIMESTAMP NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS pay (
+    pay_id TEXT PRIMARY KEY,
+    wallet TEXT NOT NULL,
+    flow TEXT NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    description TEXT,
+    issued DOUBLE PRECISION NOT NULL,
+    active BOOLEAN NOT NULL DEFAULT true
+);
+
+CREATE TABLE IF NOT EXISTS account_pay (
+    account_id TEXT NOT NULL,
+    pay_id TEXT NOT NULL,
+    PRIMARY KEY (account_id, pay_id)
+);
@@ -0,0 +1,14 @@
+-- Indexes behind the lookups in BillyWeb.
+-- Covering indexes for the projected account lookups (email -> account_id,
+-- account_id -> wallets), so they can be answered by index-only scans.
+CREATE INDEX IF NOT EXISTS account_email_account_id_idx
+    ON account (email) INCLUDE (account_id);
+CREATE INDEX IF NOT EXISTS account_account_id_wallets_idx
+    ON account (account_id) INCLUDE (wallets);
+
+-- Wallet history: account_pay by account is its primary key, then pay by id
+CREATE INDEX IF NOT EXISTS account_pay_pay_id_idx ON account_pay (pay_id);
+
+-- Only active rows are ever read
+CREATE INDEX IF NOT EXISTS pay_wallet_created_at_active_idx
+    ON pay (wallet, created_at, pay_id) WHERE active = true;
@@ -0,0 +1,28 @@
+-- Per (account, wallet, month) totals of active pay rows, kept in sync on write.
+CREATE TABLE IF NOT EXISTS wallet_monthly_rollup (
+    account_id TEXT NOT NULL,
+    wallet TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    total_in DOUBLE PRECISION NOT NULL DEFAULT 0,
+    total_out DOUBLE PRECISION NOT NULL DEFAULT 0,
+    pay_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (account_id, wallet, year, month)
+);
+
+-- Backfill only once, the table may already be maintained by the app
+INSERT INTO wallet_monthly_rollup
+    (account_id, wallet, year, month, total_in, total_out, pay_count)
+SELECT
+    account_pay.account_id,
+    pay.wallet,
+    EXTRACT(YEAR FROM pay.created_at)::INTEGER,
+    EXTRACT(MONTH FROM pay.created_at)::INTEGER,
+    COALESCE(SUM(pay.issued) FILTER (WHERE pay.flow = 'IN'), 0),
+    COALESCE(SUM(pay.issued) FILTER (WHERE pay.flow = 'OUT'), 0),
+    COUNT(*)
+FROM pay
+JOIN account_pay ON account_pay.pay_id = pay.pay_id
+WHERE pay.active = true
+    AND NOT EXISTS (SELECT 1 FROM wallet_monthly_rollup)
+GROUP BY 1, 2, 3, 4;
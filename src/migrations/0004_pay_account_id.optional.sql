@@ -0,0 +1,36 @@
+-- Optional: denormalize the owning account onto pay so wallet reads can skip
+-- the account_pay join. account_pay stays the source of truth: a pay is
+-- inserted after its account_pay row and the trigger below copies the owner,
+-- so writers never fill the column themselves. Running workers keep using
+-- the join until they are restarted.
+ALTER TABLE pay ADD COLUMN IF NOT EXISTS account_id TEXT;
+
+CREATE OR REPLACE FUNCTION pay_fill_account_id() RETURNS trigger AS $$
+BEGIN
+    IF NEW.account_id IS NULL THEN
+        SELECT account_pay.account_id INTO NEW.account_id
+        FROM account_pay
+        WHERE account_pay.pay_id = NEW.pay_id
+        LIMIT 1;
+    END IF;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS pay_fill_account_id ON pay;
+CREATE TRIGGER pay_fill_account_id
+    BEFORE INSERT ON pay
+    FOR EACH ROW EXECUTE FUNCTION pay_fill_account_id();
+
+UPDATE pay
+SET account_id = account_pay.account_id
+FROM account_pay
+WHERE account_pay.pay_id = pay.pay_id
+    AND pay.account_id IS NULL;
+
+-- Reads filter on the column alone, so no row may be left without an owner.
+-- Fails (and rolls back) if pays without an account_pay row exist.
+ALTER TABLE pay ALTER COLUMN account_id SET NOT NULL;
+
+CREATE INDEX IF NOT EXISTS pay_account_wallet_created_at_active_idx
+    ON pay (account_id, wallet, created_at, pay_id) WHERE active = true;
@@ -0,0 +1,62 @@
+-- Optional: range-partition pay by created_at month. Rows are moved into
+-- monthly partitions pay_yYYYYmMM; rows outside every partition land in
+-- pay_default. Future partitions are created by the app on startup.
+ALTER TABLE pay RENAME TO pay_unpartitioned;
+ALTER INDEX IF EXISTS pay_wallet_created_at_active_idx
+    RENAME TO pay_unpartitioned_wallet_created_at_active_idx;
+ALTER INDEX IF EXISTS pay_account_wallet_created_at_active_idx
+    RENAME TO pay_unpartitioned_account_wallet_created_at_active_idx;
+
+CREATE TABLE pay (LIKE pay_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS)
+    PARTITION BY RANGE (created_at);
+
+-- The partition key has to be part of every unique constraint
+ALTER TABLE pay ADD PRIMARY KEY (pay_id, created_at);
+CREATE INDEX pay_wallet_created_at_active_idx
+    ON pay (wallet, created_at, pay_id) WHERE active = true;
+
+CREATE TABLE pay_default PARTITION OF pay DEFAULT;
+
+DO $$
+DECLARE
+    month_start DATE;
+BEGIN
+    FOR month_start IN
+        SELECT generate_series(
+            date_trunc('month', COALESCE(bounds.first_at, now())),
+            date_trunc('month', now()) + INTERVAL '3 months',
+            INTERVAL '1 month'
+        )::DATE
+        FROM (SELECT MIN(created_at) AS first_at FROM pay_unpartitioned) AS bounds
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF pay FOR VALUES FROM (%L) TO (%L)',
+            'pay_' || to_char(month_start, '"y"YYYY"m"MM'),
+            month_start,
+            (month_start + INTERVAL '1 month')::DATE
+        );
+    END LOOP;
+
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'pay' AND column_name = 'account_id'
+    ) THEN
+        CREATE INDEX pay_account_wallet_created_at_active_idx
+            ON pay (account_id, wallet, created_at, pay_id) WHERE active = true;
+    END IF;
+END
+$$;
+
+INSERT INTO pay SELECT * FROM pay_unpartitioned;
+DROP TABLE pay_unpartitioned;
+
+-- Triggers are not copied by LIKE
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_proc WHERE proname = 'pay_fill_account_id') THEN
+        CREATE TRIGGER pay_fill_account_id
+            BEFORE INSERT ON pay
+            FOR EACH ROW EXECUTE FUNCTION pay_fill_account_id();
+    END IF;
+END
+$$;
@@ -0,0 +1,186 @@
+# Built-in imports
+from datetime import datetime
+
+# Third-party imports
+
+# Local imports
+
+
+def __new_month_bucket() -> dict:
+    return {
+        "BUDGET": 0,
+        "IN": {"data": [], "total": 0},
+        "OUT": {"data": [], "total": 0},
+        "READY_TO_SPEND": 0,
+    }
+
+
+def _aggregate_wallet_pay_data_loop(raw_datas: list) -> dict:
+    """
+    Reference row-by-row implementation of the monthly wallet summary.
+
+    `raw_datas` are pay rows ordered by `created_at` (ISO strings). Kept for
+    benchmarking and as a fallback of `_aggregate_wallet_pay_data`.
+    """
+    results = {}
+    for data in raw_datas:
+        flow = data["flow"]
+        created_at = datetime.fromisoformat(data["created_at"])
+        issued = data["issued"]
+
+        # Initialize the results structure if not already present
+        if created_at.year not in results:
+            results[created_at.year] = {}
+        if created_at.month not in results[created_at.year]:
+            results[created_at.year][created_at.month] = __new_month_bucket()
+
+        # Create a data entry for the current pay record
+        if flow == "IN":
+            results[created_at.year][created_at.month]["IN"]["data"].append(data)
+            results[created_at.year][created_at.month]["IN"]["total"] += issued
+        elif flow == "OUT":
+            results[created_at.year][created_at.month]["OUT"]["data"].append(data)
+            results[created_at.year][created_at.month]["OUT"]["total"] += issued
+
+    # Setting up BUDGET and READY_TO_SPEND
+    prev_budget = 0
+    for year in results.keys():
+        for month in results[year]:
+            data = results[year][month]
+
+            data["BUDGET"] = prev_budget
+            # Calculate READY_TO_SPEND as BUDGET + IN - OUT
+            data["READY_TO_SPEND"] = (
+                data["BUDGET"] + data["IN"]["total"] - data["OUT"]["total"]
+            )
+            prev_budget = data["READY_TO_SPEND"]
+
+    return results
+
+
+def _aggregate_wallet_pay_data(raw_datas: list) -> dict:
+    """
+    Columnar version of `_aggregate_wallet_pay_data_loop` with the same output.
+
+    Rows are bucketed by `datetime64[M]` month keys, totals are grouped sums
+    and the carried-forward BUDGET is a cumulative sum over months.
+    """
+    if not raw_datas:
+        return {}
+    # numpy takes ~0.1s to import, load it on the first summary instead of on
+    # worker startup
+    import numpy as np
+
+    try:
+        created_at = np.array(
+            [data["created_at"] for data in raw_datas], dtype="datetime64[us]"
+        )
+    except ValueError:
+        # e.g. timezone-aware timestamps, numpy can't parse those
+        return _aggregate_wallet_pay_data_loop(raw_datas)
+
+    flows = np.array([data["flow"] for data in raw_datas])
+    issued = np.array([data["issued"] for data in raw_datas])
+    is_in = flows == "IN"
+    is_out = flows == "OUT"
+
+    # Month keys in chronological order and the bucket of every row
+    month_keys, bucket = np.unique(
+        created_at.astype("datetime64[M]"), return_inverse=True
+    )
+    n_months = len(month_keys)
+
+    counts_in = np.bincount(bucket[is_in], minlength=n_months)
+    counts_out = np.bincount(bucket[is_out], minlength=n_months)
+    totals_in = np.bincount(bucket[is_in], weights=issued[is_in], minlength=n_months)
+    totals_out = np.bincount(
+        bucket[is_out], weights=issued[is_out], minlength=n_months
+    )
+    if issued.dtype.kind in "iu":
+        totals_in = totals_in.astype(np.int64)
+        totals_out = totals_out.astype(np.int64)
+
+    # READY_TO_SPEND carries over as next month's BUDGET. Interleaving +IN and
+    # -OUT keeps the loop's (BUDGET + IN) - OUT rounding for float amounts.
+    steps = np.empty(2 * n_months, dtype=totals_in.dtype)
+    steps[0::2] = totals_in
+    steps[1::2] = -totals_out
+    ready_to_spend = np.cumsum(steps)[1::2]
+
+    # Row indices grouped per (month, flow), keeping created_at order
+    flow_codes = np.where(is_in, 0, np.where(is_out, 1, 2))
+    group_keys = bucket * 3 + flow_codes
+    order = np.argsort(group_keys, kind="stable")
+    group_starts = np.flatnonzero(np.diff(group_keys[order], prepend=-1))
+    groups = np.split(order, group_starts[1:])
+
+    month_keys = month_keys.astype(np.int64)
+    years = (month_keys // 12 + 1970).tolist()
+    months = (month_keys % 12 + 1).tolist()
+    results = {}
+    for index in range(n_months):
+        results.setdefault(years[index], {})[months[index]] = {
+            "BUDGET": ready_to_spend[index - 1].item() if index else 0,
+            "IN": {
+                "data": [],
+                "total": totals_in[index].item() if counts_in[index] else 0,
+            },
+            "OUT": {
+                "data": [],
+                "total": totals_out[index].item() if counts_out[index] else 0,
+            },
+            "READY_TO_SPEND": ready_to_spend[index].item(),
+        }
+
+    for group in groups:
+        first = group[0]
+        if flow_codes[first] == 2:
+            continue
+        index = bucket[first]
+        flow = "IN" if flow_codes[first] == 0 else "OUT"
+        results[years[index]][months[index]][flow]["data"] = [
+            raw_datas[i] for i in group.tolist()
+        ]
+
+    return results
+
+
+def _filter_wallet_months(
+    results: dict, start: tuple = None, end: tuple = None
+) -> dict:
+    # Keep (year, month) buckets within [start, end], both inclusive and optional
+    filtered = {}
+    for year, months in results.items():
+        for month, data in months.items():
+            if start is not None and (year, month) < start:
+                continue
+            if end is not None and (year, month) > end:
+                continue
+            filtered.setdefault(year, {})[month] = data
+    return filtered
+
+
+def _attach_wallet_pay_data(results: dict, raw_datas: list) -> dict:
+    # Add raw rows under results[year][month][flow]["data"] of a summary
+    for months in results.values():
+        for data in months.values():
+            data["IN"] = {"data": [], "total": data["IN"]["total"]}
+            data["OUT"] = {"data": [], "total": data["OUT"]["total"]}
+
+    for data in raw_datas:
+        created_at = datetime.fromisoformat(data["created_at"])
+        month = results.get(created_at.year, {}).get(created_at.month)
+        if month is not None and data["flow"] in ("IN", "OUT"):
+            month[data["flow"]]["data"].append(data)
+
+    return results
+
+
+def _month_range_to_datetimes(start: tuple = None, end: tuple = None) -> tuple:
+    # Inclusive (year, month) bounds to [start, end) datetimes
+    start_at = datetime(start[0], start[1], 1) if start is not None else None
+    end_at = None
+    if end is not None:
+        year, month = end
+        end_at = datetime(year + month // 12, month % 12 + 1, 1)
+    return start_at, end_at
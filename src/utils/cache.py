@@ -0,0 +1,61 @@
+# Built-in imports
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable
+
+# Third-party imports
+
+# Local imports
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Bounded in-process cache with a per-entry time to live.
+
+    Holds at most `maxsize` entries, evicting the least recently used one
+    when full. Entries older than `ttl` seconds are treated as missing.
+    `get` returns `default` on a miss, so None can be cached as a value.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0) -> None:
+        if maxsize < 1:
+            raise ValueError(f"Invalid cache size: {maxsize}")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, value), LRU first
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,91 @@
+# Built-in imports
+import json
+import asyncio
+from typing import Callable, Optional
+
+# Third-party imports
+import psycopg
+
+# Local imports
+from base.config import logger
+
+# Writes to account, pay and account_pay publish {"table", "account_id", ...}
+# events on this channel from inside their transaction, so listeners only see
+# committed changes.
+CHANGE_FEED_CHANNEL = "billy_changes"
+
+
+class ChangeFeedListener:
+    """
+    Background task LISTENing for change events on one database.
+
+    `on_change(event)` is called for every event. `on_reset()` is called on
+    every (re)connect, events may have been missed while disconnected, so it
+    should drop whatever the events would have invalidated.
+    """
+
+    def __init__(
+        self,
+        on_change: Callable[[dict], None],
+        on_reset: Callable[[], None],
+        conninfo: str = "",
+        retry_after: float = 5.0,
+        **connect_kwargs,
+    ) -> None:
+        self.on_change = on_change
+        self.on_reset = on_reset
+        self.retry_after = retry_after
+        self._conninfo = conninfo
+        self._connect_kwargs = connect_kwargs
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            # Anything but cancellation (shutdown) must not end the listener,
+            # caches would then silently stop being invalidated
+            try:
+                await self._listen()
+            except asyncio.CancelledError:
+                raise
+            except psycopg.Error as e:
+                logger.warning(
+                    f"Change feed disconnected, retrying in {self.retry_after}s: {e}"
+                )
+            except Exception as e:
+                logger.error(
+                    f"Change feed failed, retrying in {self.retry_after}s: {e!r}"
+                )
+            await asyncio.sleep(self.retry_after)
+
+    async def _listen(self) -> None:
+        connection = await psycopg.AsyncConnection.connect(
+            self._conninfo, autocommit=True, **self._connect_kwargs
+        )
+        async with connection:
+            await connection.execute(f"LISTEN {CHANGE_FEED_CHANNEL};")
+            self.on_reset()
+            logger.debug(f"Listening on '{CHANGE_FEED_CHANNEL}'.")
+
+            async for notify in connection.notifies():
+                try:
+                    event = json.loads(notify.payload)
+                except ValueError:
+                    logger.warning(f"Invalid change event: {notify.payload}")
+                    continue
+                try:
+                    self.on_change(event)
+                except Exception as e:
+                    logger.error(f"Change event handler failed on {event}: {e}")
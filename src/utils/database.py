@@ -1,44 +1,223 @@
 # Built-in imports
 import os
 import json
+import time
 import uuid
+import random
 from datetime import datetime
-from contextlib import contextmanager
-from typing import Any, Dict, List, Optional, Sequence
+from contextvars import ContextVar
+from contextlib import contextmanager, asynccontextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence
 
 # Third-party imports
+import psycopg
+import psycopg2
 from psycopg2.extras import Json
+from psycopg.types.json import Json as AsyncJson
 
 
 # Local imports
 from base.config import logger
-
-__postgres_connection = None
-__postgres_cursor = None
+from utils.query_stats import QueryStats, _fingerprint, _count_query
+
+__postgres_pool = None
+__postgres_session = ContextVar("postgres_session", default=None)
+__postgres_replicas = None
+__postgres_read_session = ContextVar("postgres_read_session", default=None)
+__postgres_async_pool = None
+__postgres_async_session = ContextVar("postgres_async_session", default=None)
+__postgres_async_replicas = None
+__postgres_async_read_session = ContextVar("postgres_async_read_session", default=None)
+__postgres_shard = ContextVar("postgres_shard", default=None)
+__postgres_shard_pools: Dict[str, Any] = {}
+__postgres_async_shard_pools: Dict[str, Any] = {}
+# Column names per (shard, table), shards may differ in optional migrations
+__table_columns_cache: Dict[tuple, List[str]] = {}
 __redis_connection = None
 
+# Share of queries whose per-query logs (statements, results, row counts) are
+# emitted, e.g. 0.01 under load. Warnings and errors are never sampled.
+LOG_QUERY_SAMPLE_RATE = float(os.getenv("LOG_QUERY_SAMPLE_RATE", 1))
+# Statements taking at least this long are logged as warnings (0 disables)
+POSTGRES_SLOW_QUERY_MS = float(os.getenv("POSTGRES_SLOW_QUERY_MS", 500))
+
+__query_stats = QueryStats()
+
 
 """
 POSTGRESS
 """
 
 
-def _set_client_postgres(postgres_connection, postgres_cursor):
-    global __postgres_connection, __postgres_cursor
-    __postgres_connection = postgres_connection
-    __postgres_cursor = postgres_cursor
+def _set_client_postgres(postgres_pool):
+    global __postgres_pool
+    __postgres_pool = postgres_pool
+
+
+def _set_client_postgres_shards(postgres_pools: dict, postgres_async_pools: dict):
+    global __postgres_shard_pools, __postgres_async_shard_pools
+    __postgres_shard_pools = postgres_pools
+    __postgres_async_shard_pools = postgres_async_pools
+
+
+def _get_postgres_shards() -> list:
+    return list(__postgres_shard_pools)
+
+
+@contextmanager
+def _postgres_shard(shard: str = None):
+    """
+    Run the enclosed helpers, sync and async, against `shard` (None is the
+    default `POSTGRES_*` database).
+
+    Sessions don't span shards: a session opened on another shard is set
+    aside until the block exits, re-entering the current shard is a no-op.
+    """
+    if shard == __postgres_shard.get():
+        yield
+        return
+    if shard is not None and shard not in __postgres_shard_pools:
+        raise ValueError(f"Unknown PostgreSQL shard '{shard}'")
+
+    tokens = [
+        (__postgres_shard, __postgres_shard.set(shard)),
+        (__postgres_session, __postgres_session.set(None)),
+        (__postgres_read_session, __postgres_read_session.set(None)),
+        (__postgres_async_session, __postgres_async_session.set(None)),
+        (__postgres_async_read_session, __postgres_async_read_session.set(None)),
+    ]
+    try:
+        yield
+    finally:
+        for variable, token in reversed(tokens):
+            variable.reset(token)
 
 
-def __query_to_postgres(query: str, values=None) -> None:
-    logger.trace(f"Query: {query}")
-    logger.trace(f"Query values: {values}")
+def __current_pool():
+    shard = __postgres_shard.get()
+    return __postgres_pool if shard is None else __postgres_shard_pools[shard]
 
+
+@contextmanager
+def _postgres_session():
+    """
+    Borrow a pooled connection for the enclosed block.
+
+    Nested sessions (and every helper called inside one) reuse the same
+    connection, so a request can scope several helpers to one checkout. The
+    outermost session commits on success, rolls back on error and returns the
+    connection to the pool.
+    """
+    connection = __postgres_session.get()
+    if connection is not None:
+        yield connection
+        return
+
+    pool = __current_pool()
+    connection = pool.getconn()
+    token = __postgres_session.set(connection)
+    try:
+        yield connection
+        connection.commit()
+    except Exception:
+        if not connection.closed:
+            connection.rollback()
+        raise
+    finally:
+        __postgres_session.reset(token)
+        pool.putconn(connection)
+
+
+def _set_client_postgres_replicas(postgres_replicas):
+    global __postgres_replicas
+    __postgres_replicas = postgres_replicas
+
+
+def __getconn_for_read() -> tuple:
+    # A replica connection picked round robin, the primary when none is up.
+    # Replicas belong to the default database, shards are read directly.
+    replicas = []
+    if __postgres_replicas and __postgres_shard.get() is None:
+        replicas = __postgres_replicas.candidates()
+    for pool in replicas:
+        try:
+            return pool, pool.getconn()
+        except psycopg2.Error as e:
+            logger.warning(f"PostgreSQL replica unavailable, skipping it: {e}")
+            __postgres_replicas.mark_down(pool)
+    pool = __current_pool()
+    return pool, pool.getconn()
+
+
+@contextmanager
+def _postgres_read_session():
+    """
+    Borrow a connection for read-only helpers.
+
+    Inside a `_postgres_session()` the session's primary connection is reused,
+    so reads that follow a write in the same block see it. Otherwise a replica
+    is picked round robin; replicas that fail to connect are marked down and
+    the primary serves the read when none is available.
+    """
+    connection = __postgres_session.get()
+    if connection is None:
+        connection = __postgres_read_session.get()
+    if connection is not None:
+        yield connection
+        return
+
+    pool, connection = __getconn_for_read()
+    token = __postgres_read_session.set(connection)
+    discard = False
+    try:
+        yield connection
+    except psycopg2.OperationalError:
+        discard = True
+        if pool is not __current_pool():
+            __postgres_replicas.mark_down(pool)
+        raise
+    finally:
+        __postgres_read_session.reset(token)
+        pool.putconn(connection, discard=discard)
+
+
+def __log_query() -> bool:
+    return LOG_QUERY_SAMPLE_RATE >= 1 or random.random() < LOG_QUERY_SAMPLE_RATE
+
+
+def _get_query_stats() -> QueryStats:
+    return __query_stats
+
+
+def __record_query(query: str, seconds: float, rows: int) -> None:
+    fingerprint = _fingerprint(query)
+    __query_stats.record(fingerprint, seconds, rows)
+    _count_query(fingerprint)
+    if POSTGRES_SLOW_QUERY_MS and seconds * 1000 >= POSTGRES_SLOW_QUERY_MS:
+        logger.warning(
+            "Slow query ({:.0f}ms, {} rows): {}",
+            seconds * 1000,
+            rows,
+            " ".join(query.split()),
+        )
+
+
+def __query_to_postgres(cursor, query: str, values=None):
+    if __log_query():
+        logger.trace("Query: {}", query)
+        logger.trace("Query values: {}", values)
+
+    started = time.perf_counter()
     if values is None:
-        __postgres_cursor.execute(query)
+        cursor.execute(query)
     else:
-        __postgres_cursor.execute(query, values)
+        cursor.execute(query, values)
+    __record_query(query, time.perf_counter() - started, cursor.rowcount)
+
+    return cursor
 
-    return __postgres_cursor
+
+__WHERE_OPERATORS = ("=", "!=", "<", "<=", ">", ">=")
 
 
 def __build_where_clause(
@@ -51,12 +230,20 @@ def __build_where_clause(
     values: List[Any] = []
 
     for col, val in condition.items():
+        # Keys may carry a comparison operator, e.g. {"created_at >=": start}
+        operator = "="
+        if " " in col:
+            col, operator = col.rsplit(" ", 1)
+            if operator not in __WHERE_OPERATORS:
+                raise ValueError(f"Unsupported operator '{operator}' for {col}")
+
         if isinstance(val, list):
-            placeholders = ", ".join(["%s"] * len(val))
-            clauses.append(f"{col} IN ({placeholders})")
-            values.extend([Json(v) if isinstance(v, (dict, list)) else v for v in val])
+            # One array parameter keeps a single statement shape (and prepared
+            # statement) whatever the list length
+            clauses.append(f"{col} = ANY(%s)")
+            values.append([Json(v) if isinstance(v, (dict, list)) else v for v in val])
         else:
-            clauses.append(f"{col} = %s")
+            clauses.append(f"{col} {operator} %s")
             values.append(Json(val) if isinstance(val, (dict, list)) else val)
 
     where_clause = connector.join(clauses)
@@ -65,7 +252,8 @@ def __build_where_clause(
 
 def _check_postgres_connection() -> bool:
     try:
-        __query_to_postgres("SELECT 1")
+        with _postgres_session() as connection, connection.cursor() as cursor:
+            __query_to_postgres(cursor, "SELECT 1")
         logger.success("PostgreSQL connection is successful.")
         return True
     except Exception as e:
@@ -81,110 +269,234 @@ def _is_table_exist(table_name: str) -> bool:
             WHERE table_name = '{table_name}'
         );
     """
-    __postgres_cursor = __query_to_postgres(query)
-    is_exist = bool(__postgres_cursor.fetchone()[0])
+    with _postgres_session() as connection, connection.cursor() as cursor:
+        __query_to_postgres(cursor, query)
+        is_exist = bool(cursor.fetchone()[0])
 
-    logger.trace(f"Table {table_name} exists: {is_exist}")
+    if __log_query():
+        logger.trace("Table {} exists: {}", table_name, is_exist)
     return is_exist
 
 
+def _invalidate_table_columns(table_name: str = None) -> None:
+    # Drop cached column names for one table (or all tables) on every shard,
+    # e.g. after a migration
+    for key in list(__table_columns_cache):
+        if table_name is None or key[1] == table_name:
+            __table_columns_cache.pop(key, None)
+
+
 def _get_table_columns(table_name: str) -> list:
+    columns = __table_columns_cache.get((__postgres_shard.get(), table_name))
+    if columns is not None:
+        return columns
+
     query = f"""
         SELECT column_name 
         FROM information_schema.columns 
         WHERE table_name = '{table_name}'
         ORDER BY ordinal_position;  
     """
-    __postgres_cursor = __query_to_postgres(query)
-    results = __postgres_cursor.fetchall()
-    logger.trace(f"Query results: {results}")
+    with _postgres_session() as connection, connection.cursor() as cursor:
+        __query_to_postgres(cursor, query)
+        results = cursor.fetchall()
+    if __log_query():
+        logger.trace("Query results: {}", results)
+
+    columns = [row[0] for row in results]
+    __table_columns_cache[(__postgres_shard.get(), table_name)] = columns
+    return columns
+
 
-    return [row[0] for row in results]
+def __build_join_clause(join: Dict[str, str]) -> str:
+    # Build INNER JOIN clauses from {joined_table: "left_col = right_col"}
+    return "".join(
+        f" JOIN {join_table} ON {on_clause}" for join_table, on_clause in join.items()
+    )
 
 
-def _get_table_data(
+def __build_select_query(
     table_name: str,
     condition: dict = None,
     use_or: bool = False,
     order_by: str = None,
     order: str = "ASC",
-) -> list:
-    if condition:
-        where_clause, values = __build_where_clause(condition, use_or)
-        query = f"SELECT * FROM {table_name} WHERE {where_clause}"
+    join: Dict[str, str] = None,
+    after: Dict[str, Any] = None,
+    limit: int = None,
+    columns: List[str] = None,
+) -> tuple[str, Optional[List[Any]]]:
+    # Only the requested columns, else every column of `table_name`
+    if columns:
+        select = ", ".join(columns)
+    elif join:
+        select = f"{table_name}.*"
     else:
-        query = f"SELECT * FROM {table_name}"
-        values = None
+        select = "*"
+    query = f"SELECT {select} FROM {table_name}"
+    if join:
+        query += __build_join_clause(join)
 
-    # Add ORDER BY clause if requested
+    # Only allow ASC or DESC
+    order = order.upper()
+    if order not in ("ASC", "DESC"):
+        order = "ASC"
+
+    clauses: List[str] = []
+    values: List[Any] = []
+    if condition:
+        where_clause, where_values = __build_where_clause(condition, use_or)
+        clauses.append(f"({where_clause})")
+        values.extend(where_values)
+    if after:
+        # Keyset: rows strictly after the given (col1, col2, ...) values
+        comparison = ">" if order == "ASC" else "<"
+        placeholders = ", ".join(["%s"] * len(after))
+        clauses.append(f"({', '.join(after)}) {comparison} ({placeholders})")
+        values.extend(after.values())
+    if clauses:
+        query += f" WHERE {' AND '.join(clauses)}"
+
+    # Add ORDER BY clause if requested, a list orders by several columns
     if order_by:
-        # Only allow ASC or DESC
-        order = order.upper()
-        if order not in ("ASC", "DESC"):
-            order = "ASC"
-        query += f" ORDER BY {order_by} {order}"
+        if isinstance(order_by, str):
+            order_by = [order_by]
+        query += " ORDER BY " + ", ".join(f"{column} {order}" for column in order_by)
 
-    query += ";"
-    __postgres_cursor = __query_to_postgres(query, values)
-    results = __postgres_cursor.fetchall()
-    logger.trace(f"Query results: {results}")
-
-    columns = _get_table_columns(table_name)
-    data = [
-        {
-            key: (value.isoformat() if isinstance(value, datetime) else value)
-            for key, value in zip(columns, row)
-        }
-        for row in results
-    ]
-    return data
+    if limit is not None:
+        query += " LIMIT %s"
+        values.append(int(limit))
 
+    return query, values or None
 
-def _insert(table_name: str, data: dict) -> None:
-    # Extract columns and placeholders
-    columns = ", ".join(data.keys())
-    placeholders = ", ".join(["%s"] * len(data))
-
-    values = []
-    for raw_val in data.values():
-        # 1. If it’s already a Python list, treat it as a TEXT[] parameter
-        if isinstance(raw_val, list):
-            values.append(raw_val)
-
-        # 2. If it’s a dict, assume you want a JSON/JSONB column
-        elif isinstance(raw_val, dict):
-            values.append(Json(raw_val))
-
-        # 3. If it’s a string, check if it’s valid JSON
-        elif isinstance(raw_val, str):
-            try:
-                parsed = json.loads(raw_val)
-                # 3a. If parsed → list, send as array
-                if isinstance(parsed, list):
-                    values.append(parsed)
-                # 3b. If parsed → dict, send as JSON
-                elif isinstance(parsed, dict):
-                    values.append(Json(parsed))
-                # 3c. Otherwise, leave it as a normal string
-                else:
-                    values.append(raw_val)
-            except (ValueError, TypeError):
-                # Not JSON at all, so just pass the original string
-                values.append(raw_val)
-
-        # 4. Anything else (int, float, etc.) gets passed through
-        else:
-            values.append(raw_val)
 
-    # Build and execute the INSERT
-    query = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
-    __postgres_cursor = __query_to_postgres(query, values)
-    __postgres_connection.commit()
+def __row_to_dict(columns: List[str], row: Sequence[Any]) -> dict:
+    return {
+        key: (value.isoformat() if isinstance(value, datetime) else value)
+        for key, value in zip(columns, row)
+    }
+
 
-    logger.success(f"Data inserted into {table_name} successfully.")
+def _get_query_data(query: str, values=None) -> list:
+    # Run a hand-written SELECT (joins, aggregates, ...) and return dict rows
+    with _postgres_read_session() as connection, connection.cursor() as cursor:
+        __query_to_postgres(cursor, query, values)
+        results = cursor.fetchall()
+        if __log_query():
+            logger.trace("Query results: {}", results)
+        columns = [column.name for column in cursor.description]
+    return [__row_to_dict(columns, row) for row in results]
 
 
-def _update(table_name: str, data: dict, condition: dict, use_or: bool = False) -> None:
+def _iter_table_data(
+    table_name: str,
+    condition: dict = None,
+    use_or: bool = False,
+    order_by: str = None,
+    order: str = "ASC",
+    join: Dict[str, str] = None,
+    columns: List[str] = None,
+    batch_size: int = 1000,
+) -> Iterator[List[dict]]:
+    """
+    Same as `_aget_table_data` but yields the rows in lists of up to
+    `batch_size`.
+
+    Rows are read from a named (server-side) cursor one batch at a time, so
+    memory stays flat regardless of the result size. The generator holds its
+    own pooled connection (a replica when configured) until it is exhausted or
+    closed; it does not join the caller's session because it may be resumed
+    from other threads (e.g. by a StreamingResponse).
+    """
+    query, values = __build_select_query(
+        table_name, condition, use_or, order_by, order, join, columns=columns
+    )
+    # The shard is resolved now, the generator body may run in another context
+    return __iter_query_data(__postgres_shard.get(), query, values, batch_size)
+
+
+def __iter_query_data(
+    shard: Optional[str], query: str, values: list, batch_size: int
+) -> Iterator[List[dict]]:
+    with _postgres_shard(shard):
+        pool, connection = __getconn_for_read()
+    try:
+        with connection.cursor(name=f"iter_{uuid.uuid4().hex}") as cursor:
+            cursor.itersize = batch_size
+            __query_to_postgres(cursor, query, values)
+            columns = None
+            while True:
+                results = cursor.fetchmany(batch_size)
+                if not results:
+                    break
+                if columns is None:
+                    columns = [column.name for column in cursor.description]
+                yield [__row_to_dict(columns, row) for row in results]
+        connection.commit()
+    finally:
+        pool.putconn(connection)
+
+
+def __adapt_insert_value(raw_val: Any) -> Any:
+    # 1. If it’s already a Python list, treat it as a TEXT[] parameter
+    if isinstance(raw_val, list):
+        return raw_val
+
+    # 2. If it’s a dict, assume you want a JSON/JSONB column
+    if isinstance(raw_val, dict):
+        return Json(raw_val)
+
+    # 3. If it’s a string, check if it’s valid JSON
+    if isinstance(raw_val, str):
+        try:
+            parsed = json.loads(raw_val)
+        except (ValueError, TypeError):
+            # Not JSON at all, so just pass the original string
+            return raw_val
+        # 3a. If parsed → list, send as array
+        if isinstance(parsed, list):
+            return parsed
+        # 3b. If parsed → dict, send as JSON
+        if isinstance(parsed, dict):
+            return Json(parsed)
+        # 3c. Otherwise, leave it as a normal string
+        return raw_val
+
+    # 4. Anything else (int, float, etc.) gets passed through
+    return raw_val
+
+
+def __build_insert_rows(table_name: str, datas: List[dict]) -> tuple[list, list]:
+    # Column names and adapted value tuples, every row must share the columns
+    keys = list(datas[0].keys())
+    for data in datas:
+        if list(data.keys()) != keys:
+            raise ValueError(
+                f"All rows inserted into {table_name} must have the columns {keys}"
+            )
+    rows = [tuple(__adapt_insert_value(data[key]) for key in keys) for data in datas]
+    return keys, rows
+
+
+def __build_upsert_increment_query(
+    table_name: str, conflict_columns: List[str], keys: List[str]
+) -> str:
+    columns = ", ".join(keys)
+    conflict = ", ".join(conflict_columns)
+    set_clause = ", ".join(
+        f"{key} = {table_name}.{key} + EXCLUDED.{key}"
+        for key in keys
+        if key not in conflict_columns
+    )
+    return (
+        f"INSERT INTO {table_name} ({columns}) VALUES %s "
+        f"ON CONFLICT ({conflict}) DO UPDATE SET {set_clause}"
+    )
+
+
+def __build_update_query(
+    table_name: str, data: dict, condition: dict, use_or: bool
+) -> tuple[str, List[Any]]:
     # Extract columns and values for SET clause
     set_clause = ", ".join([f"{key} = %s" for key in data.keys()])
     set_values = [
@@ -197,14 +509,12 @@ def _update(table_name: str, data: dict, condition: dict, use_or: bool = False)
 
     # Construct parameterized query
     query = f"UPDATE {table_name} SET {set_clause} WHERE {where_clause}"
-
-    __postgres_cursor = __query_to_postgres(query, values)
-    __postgres_connection.commit()
-
-    logger.success(f"Data updated in {table_name} successfully.")
+    return query, values
 
 
-def _is_data_exist(table_name: str, condition: dict, use_or: bool = False) -> bool:
+def __build_exists_query(
+    table_name: str, condition: dict, use_or: bool
+) -> tuple[str, List[Any]]:
     # Choose connector based on use_or flag
     where_clause, values = __build_where_clause(condition, use_or)
     # Build query with WHERE clause
@@ -215,12 +525,339 @@ def _is_data_exist(table_name: str, condition: dict, use_or: bool = False) -> bo
             WHERE {where_clause}
         );
     """
-    # Execute query with values
-    __postgres_cursor = __query_to_postgres(query, values)
-    # Fetch result and convert to boolean
-    is_exist = bool(__postgres_cursor.fetchone()[0])
+    return query, values
+
+
+def _execute(query: str, values=None) -> None:
+    # Run a statement that returns nothing (DDL, maintenance, ...)
+    with _postgres_session() as connection, connection.cursor() as cursor:
+        __query_to_postgres(cursor, query, values)
+
+
+"""
+POSTGRES (ASYNC)
+"""
+
+
+def _set_client_postgres_async(postgres_async_pool):
+    global __postgres_async_pool
+    __postgres_async_pool = postgres_async_pool
+
+
+@asynccontextmanager
+async def _apostgres_session():
+    """
+    Async counterpart of `_postgres_session` on the psycopg 3 pool.
+
+    Nested sessions within the same task share one connection; the pool
+    commits when the outermost session exits cleanly and rolls back on error.
+    """
+    connection = __postgres_async_session.get()
+    if connection is not None:
+        yield connection
+        return
+
+    shard = __postgres_shard.get()
+    pool = (
+        __postgres_async_pool if shard is None else __postgres_async_shard_pools[shard]
+    )
+    async with pool.connection() as connection:
+        token = __postgres_async_session.set(connection)
+        try:
+            yield connection
+        finally:
+            __postgres_async_session.reset(token)
+
+
+def _set_client_postgres_async_replicas(postgres_async_replicas):
+    global __postgres_async_replicas
+    __postgres_async_replicas = postgres_async_replicas
+
+
+async def __agetconn_from_replica() -> tuple:
+    # A replica connection picked round robin, (None, None) when none is up
+    replicas = []
+    if __postgres_async_replicas and __postgres_shard.get() is None:
+        replicas = __postgres_async_replicas.candidates()
+    for pool in replicas:
+        try:
+            return pool, await pool.getconn()
+        except psycopg.Error as e:
+            logger.warning(f"PostgreSQL replica unavailable, skipping it: {e}")
+            __postgres_async_replicas.mark_down(pool)
+    return None, None
+
+
+@asynccontextmanager
+async def _apostgres_read_session():
+    """
+    Async counterpart of `_postgres_read_session`.
+
+    Replica pools are opened in autocommit mode, so their connections go back
+    to the pool without a transaction to roll back.
+    """
+    connection = __postgres_async_session.get()
+    if connection is None:
+        connection = __postgres_async_read_session.get()
+    if connection is not None:
+        yield connection
+        return
+
+    pool, connection = await __agetconn_from_replica()
+    if connection is None:
+        async with _apostgres_session() as connection:
+            yield connection
+        return
+
+    token = __postgres_async_read_session.set(connection)
+    try:
+        yield connection
+    except psycopg.OperationalError:
+        __postgres_async_replicas.mark_down(pool)
+        raise
+    finally:
+        __postgres_async_read_session.reset(token)
+        await pool.putconn(connection)
+
+
+def __to_async_values(values):
+    # psycopg2 Json wrappers become psycopg 3 ones
+    if values is None:
+        return None
+    return [
+        AsyncJson(value.adapted) if isinstance(value, Json) else value
+        for value in values
+    ]
+
+
+def __prepare(columns: Optional[List[str]]) -> Optional[bool]:
+    # A prepared `SELECT *` fails with "cached plan must not change result
+    # type" once another process adds a column, so only projected selects
+    # may be prepared (None leaves it to the connection's prepare_threshold)
+    return None if columns else False
+
+
+async def __aquery_to_postgres(cursor, query: str, values=None, prepare=None):
+    if __log_query():
+        logger.trace("Query: {}", query)
+        logger.trace("Query values: {}", values)
+
+    started = time.perf_counter()
+    await cursor.execute(query, __to_async_values(values), prepare=prepare)
+    __record_query(query, time.perf_counter() - started, cursor.rowcount)
+    return cursor
+
+
+async def __aexecute_values(
+    cursor, query: str, rows: List[tuple], page_size: int = 1000
+) -> None:
+    # Expand "VALUES %s" into explicit multi-row placeholders, page by page
+    for start in range(0, len(rows), page_size):
+        page = rows[start : start + page_size]
+        row_placeholders = "(" + ", ".join(["%s"] * len(page[0])) + ")"
+        paged_query = query.replace(
+            "VALUES %s", "VALUES " + ", ".join([row_placeholders] * len(page)), 1
+        )
+        values = [value for row in page for value in row]
+        await __aquery_to_postgres(cursor, paged_query, values)
+
+
+async def _aget_table_columns(table_name: str) -> list:
+    columns = __table_columns_cache.get((__postgres_shard.get(), table_name))
+    if columns is not None:
+        return columns
+
+    query = """
+        SELECT column_name
+        FROM information_schema.columns
+        WHERE table_name = %s
+        ORDER BY ordinal_position;
+    """
+    async with _apostgres_read_session() as connection, connection.cursor() as cursor:
+        await __aquery_to_postgres(cursor, query, [table_name])
+        results = await cursor.fetchall()
+
+    columns = [row[0] for row in results]
+    __table_columns_cache[(__postgres_shard.get(), table_name)] = columns
+    return columns
+
+
+async def _aget_table_data(
+    table_name: str,
+    condition: dict = None,
+    use_or: bool = False,
+    order_by: str = None,
+    order: str = "ASC",
+    join: Dict[str, str] = None,
+    columns: List[str] = None,
+    limit: int = None,
+) -> list:
+    """
+    Select rows of `table_name` as a list of dicts.
+
+    `join` maps other tables to their ON clause, e.g.
+    `{"account_pay": "account_pay.pay_id = pay.pay_id"}`; only columns of
+    `table_name` are returned and condition keys may be table-qualified.
+    `columns` narrows the select list (e.g. `["account_id"]`) and `limit`
+    caps the number of rows.
+    """
+    query, values = __build_select_query(
+        table_name,
+        condition,
+        use_or,
+        order_by,
+        order,
+        join,
+        limit=limit,
+        columns=columns,
+    )
+    query += ";"
+    async with _apostgres_read_session() as connection, connection.cursor() as cursor:
+        await __aquery_to_postgres(cursor, query, values, prepare=__prepare(columns))
+        results = await cursor.fetchall()
+        if __log_query():
+            logger.trace("Query results: {}", results)
+
+        result_columns = [column.name for column in cursor.description]
+        if columns is None:
+            __table_columns_cache[(__postgres_shard.get(), table_name)] = result_columns
+    return [__row_to_dict(result_columns, row) for row in results]
+
+
+async def _aget_query_data(query: str, values=None) -> list:
+    async with _apostgres_read_session() as connection, connection.cursor() as cursor:
+        await __aquery_to_postgres(cursor, query, values)
+        results = await cursor.fetchall()
+        if __log_query():
+            logger.trace("Query results: {}", results)
+        columns = [column.name for column in cursor.description]
+    return [__row_to_dict(columns, row) for row in results]
+
+
+async def _aget_table_page(
+    table_name: str,
+    keyset: List[str],
+    condition: dict = None,
+    use_or: bool = False,
+    order: str = "ASC",
+    join: Dict[str, str] = None,
+    after: Sequence[Any] = None,
+    limit: int = 100,
+    columns: List[str] = None,
+) -> tuple[list, Optional[list]]:
+    """
+    Keyset-paginated `_aget_table_data`.
+
+    Rows are ordered by the `keyset` columns, which must be unique together
+    (e.g. `["pay.created_at", "pay.pay_id"]`). `after` holds the keyset values
+    of the last row of the previous page. Returns the page and the `after`
+    values for the next one, or None when this is the last page.
+    """
+    query, values = __build_select_query(
+        table_name,
+        condition,
+        use_or,
+        order_by=keyset,
+        order=order,
+        join=join,
+        after=dict(zip(keyset, after)) if after else None,
+        limit=limit + 1,
+        columns=columns,
+    )
+    query += ";"
+    async with _apostgres_read_session() as connection, connection.cursor() as cursor:
+        await __aquery_to_postgres(cursor, query, values, prepare=__prepare(columns))
+        results = await cursor.fetchall()
+        if __log_query():
+            logger.trace("Query results: {}", results)
+        columns = [column.name for column in cursor.description]
+
+    data = [__row_to_dict(columns, row) for row in results[:limit]]
+    if len(results) <= limit:
+        return data, None
+
+    keys = [column.rsplit(".", 1)[-1] for column in keyset]
+    return data, [data[-1][key] for key in keys]
+
 
-    logger.info(f"Data exists in {table_name}: {is_exist}")
+async def _ainsert(table_name: str, data: dict) -> None:
+    await _ainsert_many(table_name=table_name, datas=[data])
+
+
+async def _ainsert_many(
+    table_name: str, datas: List[dict], page_size: int = 1000
+) -> None:
+    if not datas:
+        return
+
+    keys, values = __build_insert_rows(table_name, datas)
+    query = f"INSERT INTO {table_name} ({', '.join(keys)}) VALUES %s"
+    async with _apostgres_session() as connection, connection.cursor() as cursor:
+        await __aexecute_values(cursor, query, values, page_size=page_size)
+
+    if __log_query():
+        logger.success(
+            "{} rows inserted into {} successfully.", len(values), table_name
+        )
+
+
+async def _aupsert_increment(
+    table_name: str, conflict_columns: List[str], datas: List[dict]
+) -> None:
+    if not datas:
+        return
+
+    keys = list(datas[0].keys())
+    values = [tuple(data[key] for key in keys) for data in datas]
+    query = __build_upsert_increment_query(table_name, conflict_columns, keys)
+    async with _apostgres_session() as connection, connection.cursor() as cursor:
+        await __aexecute_values(cursor, query, values)
+
+    if __log_query():
+        logger.success(
+            "{} rows upserted into {} successfully.", len(values), table_name
+        )
+
+
+async def _aupdate(
+    table_name: str, data: dict, condition: dict, use_or: bool = False
+) -> None:
+    query, values = __build_update_query(table_name, data, condition, use_or)
+    async with _apostgres_session() as connection, connection.cursor() as cursor:
+        await __aquery_to_postgres(cursor, query, values)
+
+    if __log_query():
+        logger.success("Data updated in {} successfully.", table_name)
+
+
+async def _aexecute(query: str, values=None) -> list:
+    # Run a write statement, returns the rows of its RETURNING clause if any
+    async with _apostgres_session() as connection, connection.cursor() as cursor:
+        await __aquery_to_postgres(cursor, query, values)
+        if cursor.description is None:
+            return []
+        results = await cursor.fetchall()
+        columns = [column.name for column in cursor.description]
+    return [__row_to_dict(columns, row) for row in results]
+
+
+async def _anotify(channel: str, payload: dict) -> None:
+    # Delivered when the enclosing session commits, dropped on rollback
+    query = "SELECT pg_notify(%s, %s);"
+    async with _apostgres_session() as connection, connection.cursor() as cursor:
+        await __aquery_to_postgres(cursor, query, [channel, json.dumps(payload)])
+
+
+async def _ais_data_exist(
+    table_name: str, condition: dict, use_or: bool = False
+) -> bool:
+    query, values = __build_exists_query(table_name, condition, use_or)
+    async with _apostgres_read_session() as connection, connection.cursor() as cursor:
+        await __aquery_to_postgres(cursor, query, values)
+        is_exist = bool((await cursor.fetchone())[0])
+
+    if __log_query():
+        logger.info("Data exists in {}: {}", table_name, is_exist)
     return is_exist
 
 
@@ -272,3 +909,34 @@ def _retrieve_hashmap(key: str) -> Dict[str, Any]:
         return None
     # Convert bytes to str for all values
     return data
+
+
+def _store_hash_field(
+    key: str, field: str, value: str, expire_seconds: Optional[int] = None
+) -> None:
+    pipeline = __redis_connection.pipeline(transaction=False)
+    pipeline.hset(key, field, value)
+    if expire_seconds:
+        pipeline.expire(key, expire_seconds)
+    pipeline.execute()
+
+
+def _retrieve_versioned_hash_field(
+    version_key: str, key: str, field: str
+) -> tuple[int, Optional[str]]:
+    # Current version counter and a hash field in a single round trip
+    pipeline = __redis_connection.pipeline(transaction=False)
+    pipeline.get(version_key)
+    pipeline.hget(key, field)
+    version, value = pipeline.execute()
+    return int(version or 0), value
+
+
+def _increment_counters(keys: List[str], delete_keys: List[str] = None) -> None:
+    # Bump the counters and delete `delete_keys` in a single round trip
+    pipeline = __redis_connection.pipeline(transaction=False)
+    for key in keys:
+        pipeline.incr(key)
+    if delete_keys:
+        pipeline.delete(*delete_keys)
+    pipeline.execute()
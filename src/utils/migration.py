@@ -0,0 +1,118 @@
+# Built-in imports
+import os
+from pathlib import Path
+
+# Third-party imports
+
+# Local imports
+from base.config import logger
+from utils.database import (
+    _execute,
+    _get_query_data,
+    _postgres_session,
+    _invalidate_table_columns,
+)
+
+# Every `src/migrations/<version>_<name>.sql` file is applied once, in version
+# order, inside its own transaction and recorded in `schema_migrations`. Files
+# named `<version>_<name>.optional.sql` are only applied when asked for.
+MIGRATIONS_DIR = Path(__file__).resolve().parents[1] / "migrations"
+MIGRATIONS_TABLE = "schema_migrations"
+# Any constant works, it only has to be the same for every process
+MIGRATIONS_LOCK_ID = 4_210_001
+
+
+def _list_migrations(include_optional: bool = False) -> list:
+    migrations = []
+    for path in sorted(MIGRATIONS_DIR.glob("*.sql")):
+        version, _, name = path.stem.partition("_")
+        optional = name.endswith(".optional")
+        if optional and not include_optional:
+            continue
+        migrations.append(
+            {
+                "version": version,
+                "name": name.removesuffix(".optional"),
+                "path": path,
+                "optional": optional,
+            }
+        )
+    return migrations
+
+
+def __ensure_migrations_table() -> None:
+    _execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} (
+            version TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TIMESTAMP NOT NULL DEFAULT now()
+        );
+        """
+    )
+
+
+def _get_applied_migrations() -> set:
+    with _postgres_session():
+        __ensure_migrations_table()
+        rows = _get_query_data(f"SELECT version FROM {MIGRATIONS_TABLE};")
+    return {row["version"] for row in rows}
+
+
+def _get_pending_migrations(include_optional: bool = False) -> list:
+    applied = _get_applied_migrations()
+    return [
+        migration
+        for migration in _list_migrations(include_optional=include_optional)
+        if migration["version"] not in applied
+    ]
+
+
+def _apply_migrations(include_optional: bool = False) -> list:
+    """
+    Apply pending migrations and return the ones that ran.
+
+    A transaction-level advisory lock serializes concurrent callers (e.g.
+    several workers starting at once), so every migration runs exactly once.
+    """
+    applied = []
+    for migration in _list_migrations(include_optional=include_optional):
+        with _postgres_session():
+            _execute("SELECT pg_advisory_xact_lock(%s);", (MIGRATIONS_LOCK_ID,))
+            if migration["version"] in _get_applied_migrations():
+                continue
+
+            logger.info(
+                f"Applying migration {migration['version']}_{migration['name']}"
+            )
+            _execute(migration["path"].read_text())
+            _execute(
+                f"INSERT INTO {MIGRATIONS_TABLE} (version, name) VALUES (%s, %s);",
+                (migration["version"], migration["name"]),
+            )
+        applied.append(migration)
+
+    if applied:
+        _invalidate_table_columns()
+        logger.success(f"Applied {len(applied)} migration(s).")
+    return applied
+
+
+def _check_migrations() -> bool:
+    """
+    Startup check: apply pending migrations when `POSTGRES_AUTO_MIGRATE` is
+    true, otherwise report them. Returns True when the schema is up to date,
+    callers refuse to serve otherwise (optional migrations don't count).
+    """
+    auto_migrate = os.getenv("POSTGRES_AUTO_MIGRATE", "false").lower() == "true"
+    if auto_migrate:
+        _apply_migrations()
+
+    pending = _get_pending_migrations()
+    if pending:
+        names = ", ".join(f"{m['version']}_{m['name']}" for m in pending)
+        logger.warning(
+            f"Pending database migrations: {names}. Run `python migrate.py upgrade`."
+        )
+        return False
+    return True
@@ -0,0 +1,174 @@
+# Built-in imports
+from datetime import date
+
+# Third-party imports
+import psycopg2
+
+# Local imports
+from base.config import logger
+from utils.database import (
+    _execute,
+    _get_query_data,
+    _postgres_session,
+)
+
+# Monthly partitions of `pay` are named pay_yYYYYmMM, see the partition_pay
+# migration. Nothing here runs unless that migration has been applied.
+PARTITIONED_TABLE = "pay"
+DEFAULT_PARTITION = "pay_default"
+# Serializes workers creating partitions, see MIGRATIONS_LOCK_ID
+PARTITIONS_LOCK_ID = 4_210_002
+
+
+def __add_months(day: date, months: int) -> date:
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def __partition_name(month_start: date) -> str:
+    return f"{PARTITIONED_TABLE}_y{month_start.year:04d}m{month_start.month:02d}"
+
+
+def _is_pay_partitioned() -> bool:
+    rows = _get_query_data(
+        """
+        SELECT 1
+        FROM pg_partitioned_table
+        JOIN pg_class ON pg_class.oid = pg_partitioned_table.partrelid
+        WHERE pg_class.relname = %s
+            AND pg_class.relnamespace = to_regnamespace(current_schema());
+        """,
+        (PARTITIONED_TABLE,),
+    )
+    return bool(rows)
+
+
+def _get_pay_partitions() -> list:
+    # Attached monthly partitions, oldest first
+    rows = _get_query_data(
+        """
+        SELECT child.relname AS name
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = %s
+            AND parent.relnamespace = to_regnamespace(current_schema())
+            AND child.relname ~ '_y[0-9]{4}m[0-9]{2}$'
+        ORDER BY child.relname;
+        """,
+        (PARTITIONED_TABLE,),
+    )
+    return [row["name"] for row in rows]
+
+
+def __create_pay_partition(name: str, month_start: date) -> bool:
+    month_end = __add_months(month_start, 1)
+    with _postgres_session():
+        _execute("SELECT pg_advisory_xact_lock(%s);", (PARTITIONS_LOCK_ID,))
+        if name in _get_pay_partitions():
+            return False
+
+        # Rows of that month may already sit in the default partition (pays
+        # dated beyond the created months), Postgres then refuses to create
+        # the partition. Move them over with the default one detached.
+        stray = _get_query_data(
+            f"""
+            SELECT EXISTS (
+                SELECT 1 FROM {DEFAULT_PARTITION}
+                WHERE created_at >= %s AND created_at < %s
+            ) AS stray;
+            """,
+            (month_start, month_end),
+        )[0]["stray"]
+        if stray:
+            _execute(
+                f"ALTER TABLE {PARTITIONED_TABLE} DETACH PARTITION {DEFAULT_PARTITION};"
+            )
+        _execute(
+            f"CREATE TABLE {name} PARTITION OF {PARTITIONED_TABLE} "
+            "FOR VALUES FROM (%s) TO (%s);",
+            (month_start, month_end),
+        )
+        if stray:
+            _execute(
+                f"""
+                WITH moved AS (
+                    DELETE FROM {DEFAULT_PARTITION}
+                    WHERE created_at >= %s AND created_at < %s
+                    RETURNING *
+                )
+                INSERT INTO {name} SELECT * FROM moved;
+                """,
+                (month_start, month_end),
+            )
+            _execute(
+                f"ALTER TABLE {PARTITIONED_TABLE} "
+                f"ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT;"
+            )
+    return True
+
+
+def _ensure_pay_partitions(months_ahead: int = 3) -> list:
+    """
+    Create the partitions from the current month up to `months_ahead` months
+    in the future, moving their rows out of the default partition. Returns
+    the names of the partitions that were created.
+
+    A month that can't be created is logged and skipped, it is retried on
+    the next call.
+    """
+    created = []
+    with _postgres_session():
+        if not _is_pay_partitioned():
+            return created
+        existing = set(_get_pay_partitions())
+
+    current = date.today().replace(day=1)
+    for offset in range(months_ahead + 1):
+        month_start = __add_months(current, offset)
+        name = __partition_name(month_start)
+        if name in existing:
+            continue
+        try:
+            if __create_pay_partition(name, month_start):
+                created.append(name)
+        except psycopg2.Error as e:
+            logger.error(f"Failed to create pay partition {name}: {e}")
+
+    if created:
+        logger.success(f"Created pay partitions: {', '.join(created)}")
+    return created
+
+
+def _detach_pay_partitions(older_than_months: int, archive_schema: str = None) -> list:
+    """
+    Detach monthly partitions that end before `older_than_months` months ago.
+
+    Detached rows stay in their own tables, optionally moved to
+    `archive_schema`, but disappear from every `pay` read. This changes
+    results: `/wallet/get_pay` with raw rows (`include_data=True`) or
+    `aggregate=sql` drops those months and the BUDGET of every later month,
+    and archived pays can no longer be deactivated. Only the rollup-based
+    summary (`include_data=False`) still counts them.
+    """
+    cutoff = __add_months(date.today().replace(day=1), -older_than_months)
+    detached = []
+    with _postgres_session():
+        if not _is_pay_partitioned():
+            return detached
+
+        if archive_schema:
+            _execute(f"CREATE SCHEMA IF NOT EXISTS {archive_schema};")
+
+        for name in _get_pay_partitions():
+            year, month = int(name[-7:-3]), int(name[-2:])
+            if __add_months(date(year, month, 1), 1) > cutoff:
+                continue
+            _execute(f"ALTER TABLE {PARTITIONED_TABLE} DETACH PARTITION {name};")
+            if archive_schema:
+                _execute(f"ALTER TABLE {name} SET SCHEMA {archive_schema};")
+            detached.append(name)
+
+    if detached:
+        logger.success(f"Detached pay partitions: {', '.join(detached)}")
+    return detached
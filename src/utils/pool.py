@@ -0,0 +1,179 @@
+# Built-in imports
+import time
+import threading
+from collections import deque
+
+# Third-party imports
+import psycopg2
+from psycopg2.pool import PoolError
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+# Local imports
+from base.config import logger
+
+
+class PostgresPool:
+    """
+    Thread-safe PostgreSQL connection pool.
+
+    Keeps between `minconn` and `maxconn` connections open. `getconn` blocks up
+    to `timeout` seconds waiting for a free connection and raises `PoolError`
+    when none becomes available. Connections idle for longer than
+    `healthcheck_after` seconds are probed with `SELECT 1` before being handed
+    out, and broken ones are replaced transparently.
+    """
+
+    def __init__(
+        self,
+        minconn: int = 1,
+        maxconn: int = 10,
+        timeout: float = 30.0,
+        healthcheck_after: float = 30.0,
+        **connect_kwargs,
+    ) -> None:
+        if minconn < 0 or maxconn < 1 or minconn > maxconn:
+            raise ValueError(f"Invalid pool size: min={minconn}, max={maxconn}")
+
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.healthcheck_after = healthcheck_after
+        self._connect_kwargs = connect_kwargs
+
+        self._condition = threading.Condition()
+        self._idle = deque()  # (connection, last_used) pairs, most recent last
+        self._size = 0
+        self._closed = False
+
+        for _ in range(minconn):
+            self._idle.append((self._connect(), time.monotonic()))
+            self._size += 1
+
+    def _connect(self):
+        return psycopg2.connect(**self._connect_kwargs)
+
+    def _is_healthy(self, connection, last_used: float) -> bool:
+        if connection.closed:
+            return False
+        if time.monotonic() - last_used < self.healthcheck_after:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            connection.rollback()
+            return True
+        except psycopg2.Error as e:
+            logger.warning(f"Discarding unhealthy PostgreSQL connection: {e}")
+            return False
+
+    def _discard(self, connection) -> None:
+        try:
+            if not connection.closed:
+                connection.close()
+        except psycopg2.Error:
+            pass
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+
+    def getconn(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            with self._condition:
+                while True:
+                    if self._closed:
+                        raise PoolError("connection pool is closed")
+                    if self._idle:
+                        connection, last_used = self._idle.pop()
+                        break
+                    if self._size < self.maxconn:
+                        self._size += 1
+                        connection, last_used = None, None
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolError(
+                            f"timed out after {self.timeout}s waiting for a connection"
+                        )
+                    self._condition.wait(remaining)
+
+            # Open a fresh connection outside the lock
+            if connection is None:
+                try:
+                    return self._connect()
+                except Exception:
+                    with self._condition:
+                        self._size -= 1
+                        self._condition.notify()
+                    raise
+
+            if self._is_healthy(connection, last_used):
+                return connection
+            self._discard(connection)
+
+    def putconn(self, connection, discard: bool = False) -> None:
+        if not discard and not connection.closed:
+            try:
+                if connection.info.transaction_status != TRANSACTION_STATUS_IDLE:
+                    connection.rollback()
+            except psycopg2.Error:
+                discard = True
+
+        if discard or connection.closed:
+            self._discard(connection)
+            return
+
+        with self._condition:
+            if self._closed:
+                self._size -= 1
+                connection.close()
+                return
+            self._idle.append((connection, time.monotonic()))
+            self._condition.notify()
+
+    def closeall(self) -> None:
+        with self._condition:
+            self._closed = True
+            while self._idle:
+                connection, _ = self._idle.pop()
+                self._size -= 1
+                try:
+                    connection.close()
+                except psycopg2.Error:
+                    pass
+            self._condition.notify_all()
+
+
+class ReplicaSet:
+    """
+    Round-robin selection over read replica pools.
+
+    A replica whose pool fails to hand out a connection is marked down and
+    skipped for `retry_after` seconds. `candidates` returns the replicas to
+    try, in order; an empty list means every replica is down and callers
+    should read from the primary.
+    """
+
+    def __init__(self, pools: list, retry_after: float = 30.0) -> None:
+        self.pools = list(pools)
+        self.retry_after = retry_after
+
+        self._lock = threading.Lock()
+        self._next = 0
+        self._down_until = {}  # id(pool) -> monotonic time it may be retried
+
+    def __len__(self) -> int:
+        return len(self.pools)
+
+    def candidates(self) -> list:
+        with self._lock:
+            start = self._next
+            self._next = (self._next + 1) % max(len(self.pools), 1)
+        now = time.monotonic()
+        ordered = self.pools[start:] + self.pools[:start]
+        return [
+            pool for pool in ordered if self._down_until.get(id(pool), 0) <= now
+        ]
+
+    def mark_down(self, pool) -> None:
+        self._down_until[id(pool)] = time.monotonic() + self.retry_after
@@ -0,0 +1,153 @@
+# Built-in imports
+import re
+import threading
+from collections import Counter
+from functools import lru_cache
+from contextvars import ContextVar
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+# Third-party imports
+
+# Local imports
+
+# Upper bounds (ms) of the latency histogram buckets, the last one is open
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+__query_budget = ContextVar("query_budget", default=None)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+@lru_cache(maxsize=1024)
+def _fingerprint(query: str) -> str:
+    """
+    Statement shape of `query`: literals and placeholders become `?`, value
+    lists and multi-row VALUES collapse to one item, whitespace is normalized.
+    """
+    query = re.sub(r"'(?:[^']|'')*'", "?", query)
+    query = re.sub(r"%s|\$\d+|\b\d+(?:\.\d+)?\b", "?", query)
+    query = " ".join(query.split())
+    query = re.sub(r"\?(?: ?, ?\?)+", "?", query)
+    query = re.sub(r"\(\?\)(?: ?, ?\(\?\))+", "(?)", query)
+    return query.rstrip(";")
+
+
+class QueryStats:
+    """
+    Per statement fingerprint call count, total and max latency, latency
+    histogram (LATENCY_BUCKETS_MS) and rows returned or affected.
+
+    At most `maxsize` fingerprints are tracked, statements of new shapes
+    beyond that are counted under "<other>".
+    """
+
+    def __init__(self, maxsize: int = 1000) -> None:
+        self.maxsize = maxsize
+
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, fingerprint: str, seconds: float, rows: int = 0) -> None:
+        elapsed_ms = seconds * 1000
+        bucket = next(
+            (
+                index
+                for index, bound in enumerate(LATENCY_BUCKETS_MS)
+                if elapsed_ms <= bound
+            ),
+            len(LATENCY_BUCKETS_MS),
+        )
+        with self._lock:
+            stats = self._stats.get(fingerprint)
+            if stats is None:
+                if len(self._stats) >= self.maxsize:
+                    fingerprint = "<other>"
+                stats = self._stats.setdefault(
+                    fingerprint,
+                    {
+                        "calls": 0,
+                        "total_ms": 0.0,
+                        "max_ms": 0.0,
+                        "rows": 0,
+                        "histogram": [0] * (len(LATENCY_BUCKETS_MS) + 1),
+                    },
+                )
+            stats["calls"] += 1
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+            stats["rows"] += max(rows, 0)
+            stats["histogram"][bucket] += 1
+
+    def snapshot(self) -> list:
+        # Most time-consuming statements first
+        labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS]
+        labels.append(f">{LATENCY_BUCKETS_MS[-1]}ms")
+        with self._lock:
+            stats = [
+                {
+                    "fingerprint": fingerprint,
+                    **stats,
+                    "histogram": dict(zip(labels, stats["histogram"])),
+                }
+                for fingerprint, stats in self._stats.items()
+            ]
+        return sorted(stats, key=lambda stats: stats["total_ms"], reverse=True)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+class QueryBudget:
+    """
+    Queries run in a scope (e.g. one request), counted per fingerprint.
+
+    Tasks and threads started in the scope copy its context and so count
+    into the same budget.
+    """
+
+    def __init__(self, max_queries: Optional[int] = None) -> None:
+        self.max_queries = max_queries
+        self.queries = Counter()
+
+    @property
+    def count(self) -> int:
+        return sum(self.queries.values())
+
+    @property
+    def exceeded(self) -> bool:
+        return self.max_queries is not None and self.count > self.max_queries
+
+    def describe(self) -> str:
+        repeated = ", ".join(
+            f"{calls}x {fingerprint}"
+            for fingerprint, calls in self.queries.most_common(3)
+        )
+        return f"{self.count} queries (budget {self.max_queries}): {repeated}"
+
+
+def _count_query(fingerprint: str) -> None:
+    budget = __query_budget.get()
+    if budget is not None:
+        budget.queries[fingerprint] += 1
+
+
+@contextmanager
+def _query_budget(
+    max_queries: Optional[int] = None, strict: bool = True
+) -> Iterator[QueryBudget]:
+    """
+    Count the queries run in the enclosed block. With `strict`, leaving the
+    block after more than `max_queries` queries raises QueryBudgetExceeded.
+    """
+    budget = QueryBudget(max_queries=max_queries)
+    token = __query_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        __query_budget.reset(token)
+    if strict and budget.exceeded:
+        raise QueryBudgetExceeded(budget.describe())
@@ -0,0 +1,65 @@
+# Built-in imports
+import bisect
+import hashlib
+
+# Third-party imports
+
+# Local imports
+
+
+class ShardMap:
+    """
+    Consistent hash ring mapping a key (the `account_id`) to a shard name.
+
+    Every shard is placed `vnodes` times on the ring, a key belongs to the
+    first shard point at or after its hash. Adding or removing a shard only
+    moves the keys of the ring segments it gains or loses, about 1/n of them.
+    """
+
+    def __init__(self, shards: list, vnodes: int = 128) -> None:
+        if not shards:
+            raise ValueError("ShardMap needs at least one shard")
+        if len(set(shards)) != len(shards):
+            raise ValueError(f"Duplicate shard names in {shards}")
+
+        self.shards = list(shards)
+        self.vnodes = vnodes
+
+        points = sorted(
+            (self._hash(f"{shard}#{index}"), shard)
+            for shard in self.shards
+            for index in range(vnodes)
+        )
+        self._hashes = [point for point, _ in points]
+        self._owners = [shard for _, shard in points]
+
+    def __len__(self) -> int:
+        return len(self.shards)
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        # Stable across processes and Python versions, unlike hash()
+        return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big")
+
+    def shard_for(self, key: str) -> str:
+        index = bisect.bisect_left(self._hashes, self._hash(str(key)))
+        return self._owners[index % len(self._owners)]
+
+
+def _parse_shards(value: str) -> dict:
+    """
+    Parse a `name=dsn,name=dsn` shard list (e.g. `POSTGRES_SHARDS`) into a
+    `{name: dsn}` dict. Shard names must stay stable, they are hashed.
+    """
+    shards = {}
+    for item in (value or "").split(","):
+        if not item.strip():
+            continue
+        name, separator, dsn = item.partition("=")
+        name, dsn = name.strip(), dsn.strip()
+        if not separator or not name or not dsn:
+            raise ValueError(f"Invalid shard '{item.strip()}', expected name=dsn")
+        if name in shards:
+            raise ValueError(f"Duplicate shard name '{name}'")
+        shards[name] = dsn
+    return shards
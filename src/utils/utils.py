@@ -1,16 +1,14 @@
 # Built-in imports
 import os
+import json
 import uuid
+import base64
 import random
 import string
 import urllib.parse
-from datetime import datetime
+from datetime import datetime, tzinfo
 
 # Third-party imports
-import requests
-import numpy as np
-from PIL import Image
-from fastapi.responses import JSONResponse
 
 # Local imports
 
@@ -43,8 +41,31 @@ def _generate_timestamp_custom(
     return dt
 
 
-import os
-import requests
+def _to_naive_datetime(value, tz: tzinfo) -> datetime:
+    # Wall-clock time in `tz` of a datetime or ISO string, naive values are
+    # taken as already being in `tz`
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is not None:
+        value = value.astimezone(tz).replace(tzinfo=None)
+    return value
+
+
+def _encode_cursor(values: list) -> str:
+    # Opaque, URL-safe pagination cursor from keyset values
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if not isinstance(values, list):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return values
 
 
 def _make_a_request_to_api(
@@ -55,6 +76,9 @@ def _make_a_request_to_api(
     headers: dict = {},
     type_of_request: str = "json",
 ) -> tuple[int, dict]:
+    # Only used by scripts, keep `requests` out of the app's import time
+    import requests
+
     url = f"http://{os.getenv('HOST')}:{os.getenv('PORT')}{route}"
 
     method = method.upper()
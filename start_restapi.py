@@ -1,12 +1,13 @@
 # Built-in imports
 import os
 import sys
+import asyncio
+from contextlib import asynccontextmanager
 
 sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), "./src")))
 
 # Third-party imports
-import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 
@@ -14,11 +15,28 @@ load_dotenv(override=True)
 
 # Local imports
 from base.config import logger
+from app.billy_web import BillyWeb
+from utils.query_stats import _query_budget
 from api.routes import user, account, wallet, pay, utility
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Connect per worker process, after uvicorn/gunicorn forked it, so no pool
+    # or socket is shared between workers. The sync connects and migration
+    # checks run off the event loop.
+    billy_web = await asyncio.to_thread(BillyWeb)
+    # Open the async database pool inside the worker's event loop
+    await billy_web._startup()
+    app.state.billy_web = billy_web
+    yield
+    await billy_web._shutdown()
+    # Flush the enqueued log sinks
+    await logger.complete()
+
+
 # Create FastAPI app at module level
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Configure CORS
 origins = [
@@ -36,6 +54,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Queries per request above the budget are logged, or fail the request when
+# strict (e.g. in tests), to catch N+1 patterns
+QUERY_BUDGET = int(os.getenv("POSTGRES_QUERY_BUDGET", 20))
+QUERY_BUDGET_STRICT = (
+    os.getenv("POSTGRES_QUERY_BUDGET_STRICT", "false").lower() == "true"
+)
+
+
+@app.middleware("http")
+async def query_budget(request: Request, call_next):
+    with _query_budget(max_queries=QUERY_BUDGET, strict=QUERY_BUDGET_STRICT) as budget:
+        response = await call_next(request)
+    if budget.exceeded:
+        logger.warning(
+            "{} {} ran {}", request.method, request.url.path, budget.describe()
+        )
+    return response
+
+
 # Include routers
 app.include_router(user.router)
 app.include_router(account.router)
@@ -45,6 +82,8 @@ app.include_router(utility.router)
 
 
 if __name__ == "__main__":
+    import uvicorn
+
     host = os.getenv("HOST")
     port = int(os.getenv("PORT"))
     reload = os.getenv("RELOAD").lower() == "true"
@@ -0,0 +1,42 @@
+# Built-in imports
+import os
+import sys
+import time
+
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+# Third-party imports
+
+# Local imports
+from utils.cache import TTLCache
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", ["freedom_fund"])
+    cache.set("b", ["savings"])
+    assert cache.get("a") == ["freedom_fund"]
+    cache.set("c", ["charity"])
+    assert cache.get("b") is None
+    assert cache.get("a") == ["freedom_fund"] and cache.get("c") == ["charity"]
+    assert len(cache) == 2
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(maxsize=10, ttl=0.05)
+    cache.set("a", [])
+    assert cache.get("a", "missing") == []
+    time.sleep(0.06)
+    assert cache.get("a", "missing") == "missing"
+    assert len(cache) == 0
+
+
+def test_ttl_cache_invalidate():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", ["savings"])
+    cache.set("b", ["savings"])
+    cache.invalidate("a")
+    cache.invalidate("unknown")
+    assert cache.get("a") is None and cache.get("b") == ["savings"]
+    cache.clear()
+    assert len(cache) == 0
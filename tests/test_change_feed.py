@@ -0,0 +1,43 @@
+# Built-in imports
+import os
+import sys
+import asyncio
+
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+# base.config configures the logger from the environment on import
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+
+# Third-party imports
+import psycopg
+
+# Local imports
+from utils.change_feed import ChangeFeedListener
+
+
+class FlakyListener(ChangeFeedListener):
+    def __init__(self, errors: list) -> None:
+        super().__init__(on_change=print, on_reset=print, retry_after=0)
+        self.errors = errors
+        self.attempts = 0
+        self.listening = asyncio.Event()
+
+    async def _listen(self) -> None:
+        self.attempts += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        self.listening.set()
+        await asyncio.Event().wait()
+
+
+def test_change_feed_retries_until_stopped():
+    async def run() -> FlakyListener:
+        listener = FlakyListener(
+            [psycopg.OperationalError("connection lost"), RuntimeError("bug")]
+        )
+        await listener.start()
+        await asyncio.wait_for(listener.listening.wait(), timeout=1)
+        await listener.stop()
+        return listener
+
+    listener = asyncio.run(run())
+    assert listener.attempts == 3 and listener._task is None
@@ -0,0 +1,65 @@
+# Built-in imports
+import os
+import sys
+
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+# base.config configures the logger from the environment on import
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+
+# Third-party imports
+import pytest
+
+# Local imports
+from utils import database
+
+build_select_query = getattr(database, "__build_select_query")
+
+
+def test_build_select_query_keyset_page():
+    query, values = build_select_query(
+        "pay",
+        condition={"account_pay.account_id": "acc", "pay.active": True},
+        order_by=["pay.created_at", "pay.pay_id"],
+        join={"account_pay": "account_pay.pay_id = pay.pay_id"},
+        after={"pay.created_at": "2025-05-01T10:00:00", "pay.pay_id": "p1"},
+        limit=101,
+    )
+    assert query == (
+        "SELECT pay.* FROM pay JOIN account_pay ON account_pay.pay_id = pay.pay_id"
+        " WHERE (account_pay.account_id = %s AND pay.active = %s)"
+        " AND (pay.created_at, pay.pay_id) > (%s, %s)"
+        " ORDER BY pay.created_at ASC, pay.pay_id ASC LIMIT %s"
+    )
+    assert values == ["acc", True, "2025-05-01T10:00:00", "p1", 101]
+
+
+def test_build_select_query_keyset_descending_first_page():
+    query, values = build_select_query(
+        "pay", order_by=["created_at", "pay_id"], order="desc", limit=11
+    )
+    assert query == "SELECT * FROM pay ORDER BY created_at DESC, pay_id DESC LIMIT %s"
+    assert values == [11]
+
+    query, values = build_select_query(
+        "pay",
+        order_by=["created_at", "pay_id"],
+        order="desc",
+        after={"created_at": "2025-05-01T10:00:00", "pay_id": "p1"},
+    )
+    assert "WHERE (created_at, pay_id) < (%s, %s) ORDER BY" in query
+    assert values == ["2025-05-01T10:00:00", "p1"]
+
+
+def test_build_select_query_operators_and_lists():
+    query, values = build_select_query(
+        "pay",
+        condition={"created_at >=": "2025-01-01", "wallet": ["savings", "charity"]},
+        columns=["pay_id"],
+    )
+    assert query == (
+        "SELECT pay_id FROM pay WHERE (created_at >= %s AND wallet = ANY(%s))"
+    )
+    assert values == ["2025-01-01", ["savings", "charity"]]
+
+    with pytest.raises(ValueError, match="Unsupported operator"):
+        build_select_query("pay", condition={"created_at; DROP": 1})
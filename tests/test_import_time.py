@@ -0,0 +1,54 @@
+# Built-in imports
+import os
+import sys
+import subprocess
+
+# Third-party imports
+
+# Local imports
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Cumulative `-X importtime` of start_restapi (what every worker pays before
+# serving), in microseconds. importtime itself adds overhead, so it is loose.
+IMPORT_TIME_BUDGET_US = int(os.getenv("IMPORT_TIME_BUDGET_US", 1_500_000))
+# Only needed by some code paths, imported where they are used
+LAZY_MODULES = ["numpy", "PIL", "requests", "uvicorn"]
+
+
+def import_times(module: str) -> dict:
+    # {module: cumulative import time in microseconds} in a fresh interpreter
+    env = {
+        "LOG_LEVEL": "INFO",
+        "BOT_EXPIRE_LOGGED_TIME": "3600",
+        "EMAIL_PORT": "587",
+        **os.environ,
+    }
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_app_import_time_budget():
+    times = import_times("start_restapi")
+    assert times["start_restapi"] < IMPORT_TIME_BUDGET_US, (
+        f"Importing start_restapi took {times['start_restapi'] / 1000:.0f}ms, "
+        f"budget is {IMPORT_TIME_BUDGET_US / 1000:.0f}ms"
+    )
+
+
+def test_app_import_skips_lazy_modules():
+    times = import_times("start_restapi")
+    assert [module for module in LAZY_MODULES if module in times] == []
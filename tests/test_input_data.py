@@ -1,14 +1,21 @@
 # Built-in imports
 import os
 import sys
+import asyncio
 
 sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+# base.config configures the logger and billy_web reads the login expiry on import
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+os.environ.setdefault("BOT_EXPIRE_LOGGED_TIME", "3600")
 
 # Third-party imports
+import pytest
 
 # Local imports
-from base.config import logger, billy_web
-from utils.utils import _generate_timestamp_custom
+from base.config import logger
+from app.billy_web import BillyWeb
+from utils.database import _aget_table_data
+from utils.utils import _generate_timestamp_custom, _generate_unique_id
 
 inputs = [
     {
@@ -119,18 +126,50 @@ inputs = [
 ]
 
 
+@pytest.mark.skipif(
+    not os.getenv("POSTGRES_DBNAME"), reason="needs a PostgreSQL database"
+)
 def test_input_data_pay():
-    for input in inputs:
-        wallet = input["wallet"]
-        flow = input["flow"]
-        description = input["description"]
-        issued = input["issued"]
-        created_at = input["created_at"]
+    billy_web = BillyWeb()
 
-        billy_web._insert_pay_data(
-            wallet=wallet,
-            flow=flow,
-            description=description,
-            issued=issued,
-            created_at=created_at,
+    async def insert_inputs():
+        await billy_web._startup()
+        # Pays belong to an account, register a fresh one for this run
+        email = f"{_generate_unique_id()}@test.billy"
+        await billy_web._register_account(
+            full_name="Test Input Data",
+            email=email,
+            telp="0",
+            password="test",
+            pin="000000",
         )
+        account_data = await _aget_table_data(
+            table_name="account", condition={"email": email}, columns=["account_id"]
+        )
+        account_id = account_data[0]["account_id"]
+
+        for input in inputs:
+            wallet = input["wallet"]
+            flow = input["flow"]
+            description = input["description"]
+            issued = input["issued"]
+            created_at = input["created_at"]
+
+            await billy_web._insert_pay_data(
+                account_id=account_id,
+                wallet=wallet,
+                flow=flow,
+                description=description,
+                issued=issued,
+                created_at=created_at,
+            )
+        raw_data = await billy_web._get_wallet_pay_raw_data(
+            account_id=account_id, wallet="freedom_fund"
+        )
+        await billy_web._shutdown()
+        return raw_data
+
+    raw_data = asyncio.run(insert_inputs())
+    assert sorted(pay["description"] for pay in raw_data) == sorted(
+        input["description"] for input in inputs
+    )
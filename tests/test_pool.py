@@ -0,0 +1,116 @@
+# Built-in imports
+import os
+import sys
+import time
+import threading
+from types import SimpleNamespace
+
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+# base.config configures the logger from the environment on import
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+
+# Third-party imports
+import psycopg2
+import pytest
+from psycopg2.pool import PoolError
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_INTRANS
+
+# Local imports
+from utils.pool import PostgresPool, ReplicaSet
+
+
+class FakeCursor:
+    def __init__(self, connection) -> None:
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+    def execute(self, query: str) -> None:
+        if self.connection.broken:
+            raise psycopg2.OperationalError("server closed the connection")
+
+
+class FakeConnection:
+    def __init__(self) -> None:
+        self.closed = 0
+        self.broken = False
+        self.rollbacks = 0
+        self.info = SimpleNamespace(transaction_status=TRANSACTION_STATUS_IDLE)
+
+    def cursor(self) -> FakeCursor:
+        return FakeCursor(self)
+
+    def rollback(self) -> None:
+        self.rollbacks += 1
+        self.info.transaction_status = TRANSACTION_STATUS_IDLE
+
+    def close(self) -> None:
+        self.closed = 1
+
+
+class FakePool(PostgresPool):
+    def _connect(self) -> FakeConnection:
+        return FakeConnection()
+
+
+def test_pool_times_out_when_exhausted():
+    pool = FakePool(minconn=0, maxconn=1, timeout=0.05)
+    connection = pool.getconn()
+    with pytest.raises(PoolError, match="timed out"):
+        pool.getconn()
+
+    # A connection put back in the meantime is handed to the waiter
+    threading.Timer(0.05, pool.putconn, args=[connection]).start()
+    pool.timeout = 5
+    assert pool.getconn() is connection
+
+
+def test_pool_discard_frees_a_slot():
+    pool = FakePool(minconn=0, maxconn=1, timeout=0.05)
+    connection = pool.getconn()
+    pool.putconn(connection, discard=True)
+    assert connection.closed
+
+    replacement = pool.getconn()
+    assert replacement is not connection
+    # Connections left in a transaction are rolled back before reuse
+    replacement.info.transaction_status = TRANSACTION_STATUS_INTRANS
+    pool.putconn(replacement)
+    assert replacement.rollbacks == 1 and pool.getconn() is replacement
+
+
+def test_pool_health_check_replaces_broken_idle_connection():
+    pool = FakePool(minconn=1, maxconn=1, healthcheck_after=0)
+    broken, _ = pool._idle[0]
+    broken.broken = True
+
+    connection = pool.getconn()
+    assert connection is not broken and broken.closed
+    pool.putconn(connection)
+
+    # Healthy idle connections are reused after the probe
+    assert pool.getconn() is connection
+
+    pool.closeall()
+    with pytest.raises(PoolError, match="closed"):
+        pool.getconn()
+
+
+def test_replica_set_round_robin_and_mark_down():
+    first, second = object(), object()
+    replica_set = ReplicaSet([first, second], retry_after=0.05)
+    assert replica_set.candidates() == [first, second]
+    assert replica_set.candidates() == [second, first]
+
+    replica_set.mark_down(first)
+    assert replica_set.candidates() == [second]
+    replica_set.mark_down(second)
+    assert replica_set.candidates() == []
+
+    # Retried once `retry_after` has passed
+    time.sleep(0.06)
+    assert set(replica_set.candidates()) == {first, second}
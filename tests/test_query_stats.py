@@ -0,0 +1,70 @@
+# Built-in imports
+import os
+import sys
+
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+# Third-party imports
+import pytest
+
+# Local imports
+from utils.query_stats import (
+    QueryStats,
+    QueryBudgetExceeded,
+    _fingerprint,
+    _count_query,
+    _query_budget,
+)
+
+
+def test_fingerprint_ignores_values():
+    assert _fingerprint(
+        "SELECT wallets FROM account WHERE account_id = %s LIMIT 1;"
+    ) == _fingerprint("SELECT  wallets\n FROM account WHERE account_id = %s LIMIT 5")
+    assert _fingerprint("SELECT 1 FROM t WHERE name = 'it''s' AND id = ANY(%s)") == (
+        "SELECT ? FROM t WHERE name = ? AND id = ANY(?)"
+    )
+    # Multi-row VALUES of any size share one fingerprint
+    assert _fingerprint("INSERT INTO pay (a, b) VALUES (%s, %s)") == _fingerprint(
+        "INSERT INTO pay (a, b) VALUES (%s, %s), (%s, %s), (%s, %s)"
+    )
+    assert _fingerprint("SELECT * FROM pay_2025_04") == "SELECT * FROM pay_2025_04"
+
+
+def test_query_stats_records_latency_and_rows():
+    query_stats = QueryStats(maxsize=2)
+    query_stats.record("SELECT ?", 0.0005, rows=1)
+    query_stats.record("SELECT ?", 0.2, rows=3)
+    query_stats.record("UPDATE t SET a = ?", 3, rows=-1)
+    query_stats.record("DELETE FROM t", 0.01)
+
+    update, select, other = query_stats.snapshot()
+    assert update["fingerprint"] == "UPDATE t SET a = ?"
+    assert update["histogram"][">2500ms"] == 1 and update["rows"] == 0
+    assert select["calls"] == 2 and select["rows"] == 4
+    assert select["max_ms"] == pytest.approx(200)
+    assert select["histogram"]["<=1ms"] == 1 and select["histogram"]["<=250ms"] == 1
+    assert other["fingerprint"] == "<other>"
+
+    query_stats.reset()
+    assert query_stats.snapshot() == []
+
+
+def test_query_budget():
+    with _query_budget(max_queries=2) as budget:
+        _count_query("SELECT ?")
+        _count_query("SELECT ?")
+    assert budget.count == 2 and not budget.exceeded
+
+    with pytest.raises(QueryBudgetExceeded, match="3x SELECT"):
+        with _query_budget(max_queries=2):
+            for _ in range(3):
+                _count_query("SELECT ?")
+
+    with _query_budget(max_queries=2, strict=False) as budget:
+        for _ in range(3):
+            _count_query("SELECT ?")
+    assert budget.exceeded
+    # Nothing is counted outside of a budget
+    _count_query("SELECT ?")
+    assert budget.count == 3
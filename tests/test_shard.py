@@ -0,0 +1,55 @@
+# Built-in imports
+import os
+import sys
+import uuid
+from collections import Counter
+
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+# Third-party imports
+import pytest
+
+# Local imports
+from utils.shard import ShardMap, _parse_shards
+
+
+def generate_account_ids(n: int) -> list:
+    return [str(uuid.UUID(int=index * 7919 + 1)) for index in range(n)]
+
+
+def test_shard_map_is_deterministic():
+    account_ids = generate_account_ids(1000)
+    first = ShardMap(["shard0", "shard1", "shard2"])
+    second = ShardMap(["shard2", "shard0", "shard1"])
+    assert [first.shard_for(a) for a in account_ids] == [
+        second.shard_for(a) for a in account_ids
+    ]
+
+
+def test_shard_map_spreads_accounts():
+    account_ids = generate_account_ids(30_000)
+    shard_map = ShardMap(["shard0", "shard1", "shard2"])
+    counts = Counter(shard_map.shard_for(a) for a in account_ids)
+    assert set(counts) == {"shard0", "shard1", "shard2"}
+    assert min(counts.values()) > 0.25 * len(account_ids)
+
+
+def test_shard_map_adding_a_shard_moves_few_accounts():
+    account_ids = generate_account_ids(30_000)
+    before = ShardMap(["shard0", "shard1", "shard2"])
+    after = ShardMap(["shard0", "shard1", "shard2", "shard3"])
+    moved = [a for a in account_ids if before.shard_for(a) != after.shard_for(a)]
+    # Only accounts taken over by the new shard move, about a quarter of them
+    assert all(after.shard_for(a) == "shard3" for a in moved)
+    assert len(moved) < 0.35 * len(account_ids)
+
+
+def test_parse_shards():
+    assert _parse_shards(None) == {}
+    assert _parse_shards(
+        "shard0=postgresql://u@db0/billy, shard1=host=db1 dbname=billy"
+    ) == {"shard0": "postgresql://u@db0/billy", "shard1": "host=db1 dbname=billy"}
+    with pytest.raises(ValueError):
+        _parse_shards("postgresql://u@db0/billy")
+    with pytest.raises(ValueError):
+        _parse_shards("shard0=a,shard0=b")
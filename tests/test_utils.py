@@ -0,0 +1,48 @@
+# Built-in imports
+import os
+import sys
+from datetime import datetime, timezone, timedelta
+from zoneinfo import ZoneInfo
+
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+# Third-party imports
+import pytest
+
+# Local imports
+from utils.utils import _to_naive_datetime, _encode_cursor, _decode_cursor
+
+
+def test_to_naive_datetime():
+    utc = ZoneInfo("UTC")
+    # Late on the last day of the month in +07:00 is still that month in UTC,
+    # early on the first day is the previous month
+    assert _to_naive_datetime("2025-05-31T23:30:00+07:00", utc) == datetime(
+        2025, 5, 31, 16, 30
+    )
+    assert _to_naive_datetime(
+        datetime(2025, 6, 1, 3, 0, tzinfo=timezone(timedelta(hours=7))), utc
+    ) == datetime(2025, 5, 31, 20, 0)
+    # Naive values are kept as they are
+    assert _to_naive_datetime("2025-06-01 03:00:00.000000", utc) == datetime(
+        2025, 6, 1, 3, 0
+    )
+    assert _to_naive_datetime(
+        datetime(2025, 6, 1, 0, 30, tzinfo=utc), ZoneInfo("Asia/Bangkok")
+    ) == datetime(2025, 6, 1, 7, 30)
+
+
+def test_cursor_round_trip():
+    after = ["2025-05-01T10:00:00", "e7ad3e3c-e95b-440d-9373-4fd2b00001c3"]
+    cursor = _encode_cursor(after)
+    # URL-safe and unpadded, so it can go in a query string as is
+    assert "=" not in cursor and "+" not in cursor and "/" not in cursor
+    assert _decode_cursor(cursor) == after
+
+
+@pytest.mark.parametrize(
+    "cursor", ["not a cursor!", _encode_cursor({"a": 1})[:-2], "eyJhIjogMX0"]
+)
+def test_decode_cursor_rejects_invalid(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        _decode_cursor(cursor)
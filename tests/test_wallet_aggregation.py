@@ -0,0 +1,101 @@
+# Built-in imports
+import os
+import sys
+import random
+from datetime import datetime, timedelta
+
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+# Third-party imports
+
+# Local imports
+from utils.aggregation import (
+    _aggregate_wallet_pay_data,
+    _aggregate_wallet_pay_data_loop,
+    _attach_wallet_pay_data,
+    _filter_wallet_months,
+    _month_range_to_datetimes,
+)
+
+
+def generate_raw_datas(n: int, integer_issued: bool = True, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    start = datetime(2020, 1, 1)
+    created_ats = sorted(
+        start + timedelta(seconds=rng.randint(0, 5 * 365 * 24 * 3600))
+        for _ in range(n)
+    )
+    return [
+        {
+            "pay_id": str(index),
+            "wallet": "freedom_fund",
+            "flow": rng.choice(["IN", "OUT"]),
+            "created_at": created_at.isoformat(),
+            "description": "GENERATED",
+            "issued": (
+                rng.randint(1000, 900000)
+                if integer_issued
+                else round(rng.uniform(1, 9000), 2)
+            ),
+            "active": True,
+        }
+        for index, created_at in enumerate(created_ats)
+    ]
+
+
+def test_aggregate_wallet_pay_data_empty():
+    assert _aggregate_wallet_pay_data([]) == {}
+
+
+def test_aggregate_wallet_pay_data_matches_loop_integer():
+    raw_datas = generate_raw_datas(5000)
+    assert _aggregate_wallet_pay_data(raw_datas) == _aggregate_wallet_pay_data_loop(
+        raw_datas
+    )
+
+
+def test_aggregate_wallet_pay_data_matches_loop_float():
+    raw_datas = generate_raw_datas(5000, integer_issued=False)
+    assert _aggregate_wallet_pay_data(raw_datas) == _aggregate_wallet_pay_data_loop(
+        raw_datas
+    )
+
+
+def test_attach_wallet_pay_data_on_month_range():
+    raw_datas = generate_raw_datas(5000)
+    full = _aggregate_wallet_pay_data_loop(raw_datas)
+    summary = {
+        year: {
+            month: {
+                "BUDGET": data["BUDGET"],
+                "IN": {"total": data["IN"]["total"]},
+                "OUT": {"total": data["OUT"]["total"]},
+                "READY_TO_SPEND": data["READY_TO_SPEND"],
+            }
+            for month, data in months.items()
+        }
+        for year, months in full.items()
+    }
+
+    start, end = _month_range_to_datetimes((2021, 11), (2022, 12))
+    assert start == datetime(2021, 11, 1) and end == datetime(2023, 1, 1)
+    raw_datas_in_range = [
+        data
+        for data in raw_datas
+        if start <= datetime.fromisoformat(data["created_at"]) < end
+    ]
+    results = _attach_wallet_pay_data(
+        _filter_wallet_months(summary, start=(2021, 11), end=(2022, 12)),
+        raw_datas_in_range,
+    )
+    assert results == _filter_wallet_months(full, start=(2021, 11), end=(2022, 12))
+    assert list(results) == [2021, 2022] and len(results[2022]) == 12
+
+
+def test_aggregate_wallet_pay_data_matches_loop_large():
+    # Five years of rows, each month sums thousands of values. Timings of
+    # both versions: `python benchmarks/wallet_aggregation.py`
+    raw_datas = generate_raw_datas(100_000)
+    assert _aggregate_wallet_pay_data(raw_datas) == _aggregate_wallet_pay_data_loop(
+        raw_datas
+    )